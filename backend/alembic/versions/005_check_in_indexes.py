@@ -0,0 +1,33 @@
+"""add check-in time and active check-in indexes
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Range scans for today's check-ins
+    op.create_index('ix_check_ins_check_in_time', 'check_ins', ['check_in_time'])
+
+    # Partial index for check-ins that have not been checked out
+    op.create_index(
+        'ix_check_ins_active',
+        'check_ins',
+        ['id'],
+        postgresql_where=sa.text('check_out_time IS NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_check_ins_active', table_name='check_ins')
+    op.drop_index('ix_check_ins_check_in_time', table_name='check_ins')
@@ -0,0 +1,38 @@
+"""add dashboard stats materialized view
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-15 12:10:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE MATERIALIZED VIEW mv_dashboard_stats AS
+        SELECT
+            1 AS id,
+            (SELECT count(*) FROM members) AS total_members,
+            (SELECT count(*) FROM members
+                WHERE membership_status = 'active') AS active_members,
+            (SELECT count(*) FROM check_ins
+                WHERE check_in_time >= date_trunc('day', now(), 'UTC')
+                AND check_in_time < date_trunc('day', now(), 'UTC') + interval '1 day'
+            ) AS today_check_ins,
+            (SELECT count(*) FROM check_ins
+                WHERE check_out_time IS NULL) AS active_check_ins
+    """)
+
+    # A unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.execute("CREATE UNIQUE INDEX ix_mv_dashboard_stats_id ON mv_dashboard_stats (id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW mv_dashboard_stats")
@@ -0,0 +1,24 @@
+"""add member status and payment status indexes
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-15 12:20:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_members_membership_status', 'members', ['membership_status'])
+    op.create_index('ix_payments_status_created_at', 'payments', ['status', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_payments_status_created_at', table_name='payments')
+    op.drop_index('ix_members_membership_status', table_name='members')
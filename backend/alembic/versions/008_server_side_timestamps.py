@@ -0,0 +1,47 @@
+"""use timezone-aware server-side timestamps for payments and facility configs
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-15 12:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+# (table, column) pairs populated by the database on insert
+TIMESTAMP_COLUMNS = [
+    ('facility_configs', 'created_at'),
+    ('facility_configs', 'updated_at'),
+    ('payments', 'created_at'),
+    ('payments', 'updated_at'),
+    ('payment_history', 'created_at'),
+]
+
+
+def upgrade() -> None:
+    # Existing values were written with datetime.utcnow()
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'"
+        )
+
+
+def downgrade() -> None:
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.DateTime(),
+            server_default=sa.text('now()') if column == 'created_at' else None,
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'"
+        )
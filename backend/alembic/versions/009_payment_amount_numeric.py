@@ -0,0 +1,35 @@
+"""store payment amounts as numeric
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-15 12:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        'payments',
+        'amount',
+        type_=sa.Numeric(12, 2),
+        existing_nullable=False,
+        postgresql_using='amount::numeric(12,2)'
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'payments',
+        'amount',
+        type_=sa.Float(),
+        existing_nullable=False,
+        postgresql_using='amount::double precision'
+    )
@@ -0,0 +1,44 @@
+"""store payment history metadata as jsonb
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-15 12:50:00.000000
+
+"""
+from alembic import op
+from sqlalchemy.dialects import postgresql
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        'payment_history',
+        'metadata',
+        type_=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using='metadata::jsonb'
+    )
+    op.create_index(
+        'ix_payment_history_metadata_gin',
+        'payment_history',
+        ['metadata'],
+        postgresql_using='gin',
+        postgresql_ops={'metadata': 'jsonb_path_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_payment_history_metadata_gin', table_name='payment_history')
+    op.alter_column(
+        'payment_history',
+        'metadata',
+        type_=sa.String(),
+        existing_nullable=True,
+        postgresql_using='metadata::text'
+    )
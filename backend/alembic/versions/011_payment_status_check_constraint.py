@@ -0,0 +1,52 @@
+"""store payment status as text with a check constraint
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-15 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+PAYMENT_STATUSES = ('pending', 'processing', 'succeeded', 'failed', 'refunded', 'canceled')
+
+
+def upgrade() -> None:
+    # The enum type stored member names (e.g. 'PENDING'); store values instead
+    op.alter_column(
+        'payments',
+        'status',
+        type_=sa.String(16),
+        existing_nullable=False,
+        server_default='pending',
+        postgresql_using='lower(status::text)'
+    )
+    op.execute('DROP TYPE paymentstatus')
+    op.create_check_constraint(
+        'ck_payments_status',
+        'payments',
+        "status IN ({})".format(", ".join(f"'{s}'" for s in PAYMENT_STATUSES))
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('ck_payments_status', 'payments', type_='check')
+    op.execute("""
+        CREATE TYPE paymentstatus AS ENUM (
+            'PENDING', 'PROCESSING', 'SUCCEEDED', 'FAILED', 'REFUNDED', 'CANCELED'
+        )
+    """)
+    op.alter_column('payments', 'status', server_default=None)
+    op.alter_column(
+        'payments',
+        'status',
+        type_=sa.Enum(name='paymentstatus'),
+        existing_nullable=False,
+        postgresql_using='upper(status)::paymentstatus'
+    )
@@ -0,0 +1,30 @@
+"""add partial index for active memberships
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-15 13:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # current_date is not immutable, so a generated column cannot hold this;
+    # index end dates of active members and filter on them at query time
+    op.create_index(
+        'ix_members_active_end_date',
+        'members',
+        ['membership_end_date'],
+        postgresql_where=sa.text("membership_status = 'active'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_members_active_end_date', table_name='members')
@@ -0,0 +1,30 @@
+"""add payment retry and member status indexes
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-15 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_payments_retry_due',
+        'payments',
+        ['next_retry_at'],
+        postgresql_where=sa.text("status = 'failed' AND retry_count < 5")
+    )
+    op.create_index('ix_payments_member_status', 'payments', ['member_id', 'status'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_payments_member_status', table_name='payments')
+    op.drop_index('ix_payments_retry_due', table_name='payments')
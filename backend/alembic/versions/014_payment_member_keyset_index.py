@@ -0,0 +1,27 @@
+"""add payment keyset pagination index
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-15 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_payments_member_created_at',
+        'payments',
+        ['member_id', sa.text('created_at DESC'), sa.text('id DESC')]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_payments_member_created_at', table_name='payments')
@@ -0,0 +1,39 @@
+"""use timezone-aware payment event timestamps
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-15 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '015'
+down_revision = '014'
+branch_labels = None
+depends_on = None
+
+# Columns now stamped with now() by the database
+TIMESTAMP_COLUMNS = ['next_retry_at', 'paid_at', 'refunded_at']
+
+
+def upgrade() -> None:
+    # Existing values were written with datetime.utcnow()
+    for column in TIMESTAMP_COLUMNS:
+        op.alter_column(
+            'payments',
+            column,
+            type_=sa.DateTime(timezone=True),
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'"
+        )
+
+
+def downgrade() -> None:
+    for column in TIMESTAMP_COLUMNS:
+        op.alter_column(
+            'payments',
+            column,
+            type_=sa.DateTime(),
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'"
+        )
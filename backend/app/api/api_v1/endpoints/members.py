@@ -6,12 +6,15 @@ from app.schemas.member import (
     MemberCreate,
     MemberUpdate,
     MemberResponse,
+    MemberResponseListAdapter,
     CheckInCreate,
     CheckInResponse,
+    CheckInResponseListAdapter,
     CheckOutUpdate,
 )
 from app.services.member_service import MemberService
 from app.core.dependencies import get_current_user, require_role
+from app.core.responses import list_response
 from app.models.user import User, UserRole
 
 router = APIRouter()
@@ -29,15 +32,36 @@ async def create_member(
     return await MemberService.create_member(db, member_data)
 
 
+@router.post(
+    "/bulk",
+    response_model=List[MemberResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_members_bulk(
+    members_data: List[MemberCreate],
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_role(UserRole.STAFF)),
+):
+    """Create many member profiles (e.g. from an import)."""
+    members = await MemberService.create_members_bulk(db, members_data)
+    return list_response(
+        MemberResponseListAdapter, members, status_code=status.HTTP_201_CREATED
+    )
+
+
 @router.get("/", response_model=List[MemberResponse])
 async def list_members(
     skip: int = 0,
     limit: int = 100,
+    active_only: bool = False,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_role(UserRole.STAFF)),
 ):
     """Get all members."""
-    return await MemberService.get_members(db, skip=skip, limit=limit)
+    members = await MemberService.get_members(
+        db, skip=skip, limit=limit, active_only=active_only
+    )
+    return list_response(MemberResponseListAdapter, members)
 
 
 @router.get("/{member_id}", response_model=MemberResponse)
@@ -133,6 +157,17 @@ async def check_in(
     return await MemberService.check_in_member(db, check_in_data)
 
 
+@router.post("/check-in/bulk", response_model=List[CheckInResponse])
+async def check_in_bulk(
+    check_ins_data: List[CheckInCreate],
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_role(UserRole.STAFF)),
+):
+    """Check in many members at once."""
+    check_ins = await MemberService.check_in_members_bulk(db, check_ins_data)
+    return list_response(CheckInResponseListAdapter, check_ins)
+
+
 @router.put("/check-out/{check_in_id}", response_model=CheckInResponse)
 async def check_out(
     check_in_id: int,
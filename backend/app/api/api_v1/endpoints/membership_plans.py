@@ -6,9 +6,11 @@ from app.schemas.member import (
     MembershipPlanCreate,
     MembershipPlanUpdate,
     MembershipPlanResponse,
+    MembershipPlanResponseListAdapter,
 )
 from app.services.membership_plan_service import MembershipPlanService
 from app.core.dependencies import get_current_user, require_role
+from app.core.responses import list_response
 from app.models.user import User, UserRole
 
 router = APIRouter()
@@ -37,9 +39,15 @@ async def list_plans(
     current_user: User = Depends(get_current_user),
 ):
     """Get all membership plans."""
-    return await MembershipPlanService.get_plans(
-        db, skip=skip, limit=limit, active_only=active_only
-    )
+    if active_only:
+        plans = await MembershipPlanService.get_active_plans_cached(
+            db, skip=skip, limit=limit
+        )
+    else:
+        plans = await MembershipPlanService.get_plans(
+            db, skip=skip, limit=limit, active_only=False
+        )
+    return list_response(MembershipPlanResponseListAdapter, plans)
 
 
 @router.get("/{plan_id}", response_model=MembershipPlanResponse)
@@ -49,7 +57,7 @@ async def get_plan(
     current_user: User = Depends(get_current_user),
 ):
     """Get membership plan by ID."""
-    plan = await MembershipPlanService.get_plan(db, plan_id)
+    plan = await MembershipPlanService.get_plan_cached(db, plan_id)
     if not plan:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
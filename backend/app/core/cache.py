@@ -0,0 +1,79 @@
+"""
+Shared Redis client and JSON caching helpers.
+
+Cache failures are logged and treated as misses so Redis outages degrade to
+direct database reads instead of failing requests.
+"""
+
+from typing import Any, Optional
+import logging
+
+import orjson
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Global Redis client instance (connections are opened lazily from its pool)
+redis_client = aioredis.from_url(settings.REDIS_URL)
+
+
+async def cache_get_json(key: str) -> Optional[Any]:
+    """
+    Get a JSON value from the cache.
+
+    Args:
+        key: Cache key
+
+    Returns:
+        Decoded value, or None on a miss or cache error
+    """
+    try:
+        raw = await redis_client.get(key)
+    except RedisError as e:
+        logger.warning(f"Cache read failed for {key}: {e}")
+        return None
+
+    return orjson.loads(raw) if raw is not None else None
+
+
+async def cache_set_json(key: str, value: Any, ttl_seconds: int) -> None:
+    """
+    Store a JSON-serializable value in the cache.
+
+    Args:
+        key: Cache key
+        value: Value to serialize
+        ttl_seconds: Expiry in seconds
+    """
+    try:
+        await redis_client.set(key, orjson.dumps(value), ex=ttl_seconds)
+    except RedisError as e:
+        logger.warning(f"Cache write failed for {key}: {e}")
+
+
+async def cache_delete(*keys: str) -> None:
+    """Remove keys from the cache."""
+    try:
+        await redis_client.delete(*keys)
+    except RedisError as e:
+        logger.warning(f"Cache delete failed for {keys}: {e}")
+
+
+async def cache_delete_pattern(pattern: str) -> None:
+    """
+    Remove all keys matching a glob pattern.
+
+    Uses SCAN, so it is meant for small key families such as list pages.
+
+    Args:
+        pattern: Redis glob pattern, e.g. "plans:*"
+    """
+    try:
+        keys = [key async for key in redis_client.scan_iter(match=pattern)]
+        if keys:
+            await redis_client.delete(*keys)
+    except RedisError as e:
+        logger.warning(f"Cache delete failed for {pattern}: {e}")
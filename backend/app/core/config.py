@@ -14,10 +14,19 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     DATABASE_POOL_SIZE: int = 20
     DATABASE_MAX_OVERFLOW: int = 0
+    DATABASE_STATEMENT_CACHE_SIZE: int = 1024
+    DATABASE_QUERY_CACHE_SIZE: int = 1200
 
     # Redis
     REDIS_URL: str
 
+    # Background jobs
+    DASHBOARD_STATS_REFRESH_SECONDS: int = 30
+    LAST_LOGIN_FLUSH_SECONDS: int = 5
+    # Retries charge cards; enable in exactly one process
+    PAYMENT_RETRY_JOB_ENABLED: bool = False
+    PAYMENT_RETRY_INTERVAL_SECONDS: int = 300
+
     # JWT
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
@@ -6,12 +6,30 @@ from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail, Email, To, Content, Personalization
 from python_http_client.exceptions import HTTPError
 from typing import Optional, List, Dict, Any
+import asyncio
+import html
 import logging
+import re
+
+import httpx
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+SENDGRID_API_BASE_URL = "https://api.sendgrid.com"
+
+# Matches HTML tags when deriving a plain-text alternative
+_BR_RE = re.compile(r"<br\s*/?>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def _html_to_text(html_content: str) -> str:
+    """Strip tags from HTML content to build a plain-text alternative."""
+    text = html.unescape(_TAG_RE.sub("", _BR_RE.sub("\n", html_content)))
+    lines = (line.strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
 
 class SendGridClient:
     """
@@ -29,6 +47,47 @@ class SendGridClient:
             self.client = SendGridAPIClient(self.api_key)
             logger.info("SendGrid client initialized successfully")
 
+        # Shared HTTP/2 client for async sends, created on first use
+        self._async_client: Optional[httpx.AsyncClient] = None
+
+    def _build_mail(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        plain_content: Optional[str] = None,
+        from_email: Optional[str] = None,
+        reply_to: Optional[str] = None
+    ) -> Mail:
+        """Build a single-recipient message with a plain-text alternative."""
+        if plain_content is None:
+            plain_content = _html_to_text(html_content)
+
+        message = Mail(
+            from_email=from_email or self.from_email,
+            to_emails=to_email,
+            subject=subject,
+            html_content=html_content,
+            plain_text_content=plain_content
+        )
+
+        if reply_to:
+            message.reply_to = reply_to
+
+        return message
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Get the shared async HTTP/2 client, creating it if needed."""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                base_url=SENDGRID_API_BASE_URL,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=4, max_connections=8),
+                timeout=30.0,
+            )
+        return self._async_client
+
     def send_email(
         self,
         to_email: str,
@@ -45,7 +104,7 @@ class SendGridClient:
             to_email: Recipient email address
             subject: Email subject
             html_content: HTML email content
-            plain_content: Plain text email content
+            plain_content: Plain text email content (derived from HTML if omitted)
             from_email: Sender email (defaults to configured email)
             reply_to: Reply-to email address
 
@@ -57,17 +116,10 @@ class SendGridClient:
             return False
 
         try:
-            message = Mail(
-                from_email=from_email or self.from_email,
-                to_emails=to_email,
-                subject=subject,
-                html_content=html_content,
-                plain_text_content=plain_content
+            message = self._build_mail(
+                to_email, subject, html_content, plain_content, from_email, reply_to
             )
 
-            if reply_to:
-                message.reply_to = reply_to
-
             response = self.client.send(message)
 
             logger.info(f"Email sent successfully to {to_email}: status {response.status_code}")
@@ -80,6 +132,82 @@ class SendGridClient:
             logger.error(f"Unexpected error sending email to {to_email}: {e}")
             return False
 
+    async def send_email_async(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        plain_content: Optional[str] = None,
+        from_email: Optional[str] = None,
+        reply_to: Optional[str] = None
+    ) -> bool:
+        """
+        Send a single email over the shared HTTP/2 connection.
+
+        Args:
+            to_email: Recipient email address
+            subject: Email subject
+            html_content: HTML email content
+            plain_content: Plain text email content (derived from HTML if omitted)
+            from_email: Sender email (defaults to configured email)
+            reply_to: Reply-to email address
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.client:
+            logger.error("SendGrid client not initialized - cannot send email")
+            return False
+
+        try:
+            message = self._build_mail(
+                to_email, subject, html_content, plain_content, from_email, reply_to
+            )
+
+            response = await self._get_async_client().post(
+                "/v3/mail/send", json=message.get()
+            )
+
+            if response.status_code not in [200, 201, 202]:
+                logger.error(f"Failed to send email to {to_email}: {response.text}")
+                return False
+
+            logger.info(f"Email sent successfully to {to_email}: status {response.status_code}")
+            return True
+
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to send email to {to_email}: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"Unexpected error sending email to {to_email}: {e}")
+            return False
+
+    async def send_emails_async(
+        self,
+        messages: List[Dict[str, Any]]
+    ) -> List[bool]:
+        """
+        Send many individual emails concurrently.
+
+        Requests are multiplexed over the shared HTTP/2 client rather than
+        opening a connection per message.
+
+        Args:
+            messages: List of keyword-argument dictionaries for send_email_async
+
+        Returns:
+            List of per-message success flags, in input order
+        """
+        return await asyncio.gather(
+            *(self.send_email_async(**message) for message in messages)
+        )
+
+    async def aclose(self) -> None:
+        """Close the shared async HTTP client."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
     def send_template_email(
         self,
         to_email: str,
@@ -145,7 +273,7 @@ class SendGridClient:
             recipients: List of dictionaries with 'email' and optional 'name'
             subject: Email subject
             html_content: HTML email content
-            plain_content: Plain text email content
+            plain_content: Plain text email content (derived from HTML if omitted)
             from_email: Sender email (defaults to configured email)
 
         Returns:
@@ -155,6 +283,9 @@ class SendGridClient:
             logger.error("SendGrid client not initialized - cannot send email")
             return False
 
+        if plain_content is None:
+            plain_content = _html_to_text(html_content)
+
         try:
             message = Mail(
                 from_email=from_email or self.from_email,
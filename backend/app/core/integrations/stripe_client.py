@@ -3,9 +3,17 @@ Stripe integration for payment processing.
 """
 
 import stripe
-from typing import Optional, Dict, Any
+import hashlib
+import hmac
+import inspect
+import orjson
+import threading
+import time
+from cachetools import TTLCache
+from functools import lru_cache, wraps
+from typing import Optional, Dict, Any, Callable, List, Tuple
 import logging
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_UP
 
 from app.core.config import settings
 
@@ -14,6 +22,74 @@ logger = logging.getLogger(__name__)
 # Initialize Stripe
 stripe.api_key = settings.STRIPE_SECRET_KEY
 
+# Customers are re-read several times per checkout; keep them briefly
+CUSTOMER_CACHE_SIZE = 1024
+CUSTOMER_CACHE_TTL_SECONDS = 60
+
+# Maximum age of a webhook signature timestamp (matches the Stripe SDK default)
+WEBHOOK_TOLERANCE_SECONDS = 300
+
+
+def _stripe_call(action: str) -> Callable:
+    """
+    Wrap a Stripe API call so errors are logged and None is returned.
+
+    Arguments named id or ending in _id are included in the log; other
+    arguments (emails, amounts) are left out.
+
+    Args:
+        action: Human-readable description used in the error log
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return func(self, *args, **kwargs)
+            except stripe.error.StripeError as e:
+                arguments = signature.bind(self, *args, **kwargs).arguments
+                ids = {
+                    name: value for name, value in arguments.items()
+                    if (name == "id" or name.endswith("_id")) and value
+                }
+                logger.error(
+                    f"Failed to {action} {ids}: {e}",
+                    extra={"stripe_action": action, "stripe_ids": ids},
+                )
+                return None
+        return wrapper
+    return decorator
+
+
+@lru_cache(maxsize=8)
+def _webhook_secret_bytes(webhook_secret: str) -> bytes:
+    """Encode a webhook secret once and reuse it for every signature check."""
+    return webhook_secret.encode()
+
+
+def _parse_signature_header(sig_header: str) -> Tuple[Optional[int], List[str]]:
+    """Split a Stripe-Signature header into its timestamp and v1 signatures."""
+    timestamp = None
+    signatures = []
+    for item in sig_header.split(","):
+        key, _, value = item.strip().partition("=")
+        if key == "t":
+            try:
+                timestamp = int(value)
+            except ValueError:
+                return None, []
+        elif key == "v1":
+            signatures.append(value)
+    return timestamp, signatures
+
+
+def _to_cents(amount: Decimal) -> int:
+    """Convert a dollar amount to integer cents, rounding half up."""
+    if not isinstance(amount, Decimal):
+        amount = Decimal(str(amount))
+    return int(amount.scaleb(2).to_integral_value(rounding=ROUND_HALF_UP))
+
 
 class StripeClient:
     """
@@ -25,11 +101,23 @@ class StripeClient:
         if not self.api_key:
             logger.warning("Stripe API key not configured - payment processing will not work")
 
+        self._customer_cache: TTLCache = TTLCache(
+            maxsize=CUSTOMER_CACHE_SIZE, ttl=CUSTOMER_CACHE_TTL_SECONDS
+        )
+        self._customer_cache_lock = threading.Lock()
+
+    def _cache_customer(self, customer: stripe.Customer) -> None:
+        """Store a customer in the local cache."""
+        with self._customer_cache_lock:
+            self._customer_cache[customer.id] = customer
+
+    @_stripe_call("create Stripe customer")
     def create_customer(
         self,
         email: str,
         name: str,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None
     ) -> Optional[stripe.Customer]:
         """
         Create a Stripe customer.
@@ -38,51 +126,58 @@ class StripeClient:
             email: Customer email
             name: Customer name
             metadata: Additional metadata
+            idempotency_key: Key that makes retried requests safe
 
         Returns:
             Stripe Customer object or None if failed
         """
-        try:
-            customer = stripe.Customer.create(
-                email=email,
-                name=name,
-                metadata=metadata or {}
-            )
-            logger.info(f"Stripe customer created: {customer.id}")
-            return customer
-        except stripe.error.StripeError as e:
-            logger.error(f"Failed to create Stripe customer: {e}")
-            return None
-
+        customer = stripe.Customer.create(
+            email=email,
+            name=name,
+            metadata=metadata or {},
+            idempotency_key=idempotency_key
+        )
+        logger.info(f"Stripe customer created: {customer.id}")
+        self._cache_customer(customer)
+        return customer
+
+    @_stripe_call("retrieve Stripe customer")
     def get_customer(self, customer_id: str) -> Optional[stripe.Customer]:
-        """Get a Stripe customer by ID."""
-        try:
-            return stripe.Customer.retrieve(customer_id)
-        except stripe.error.StripeError as e:
-            logger.error(f"Failed to retrieve Stripe customer {customer_id}: {e}")
-            return None
+        """Get a Stripe customer by ID, served from a short-lived cache."""
+        with self._customer_cache_lock:
+            customer = self._customer_cache.get(customer_id)
+
+        if customer is None:
+            customer = stripe.Customer.retrieve(customer_id)
+            self._cache_customer(customer)
 
+        return customer
+
+    @_stripe_call("update Stripe customer")
     def update_customer(
         self,
         customer_id: str,
         **kwargs
     ) -> Optional[stripe.Customer]:
         """Update a Stripe customer."""
-        try:
-            customer = stripe.Customer.modify(customer_id, **kwargs)
-            logger.info(f"Stripe customer updated: {customer_id}")
-            return customer
-        except stripe.error.StripeError as e:
-            logger.error(f"Failed to update Stripe customer {customer_id}: {e}")
-            return None
+        with self._customer_cache_lock:
+            self._customer_cache.pop(customer_id, None)
+
+        customer = stripe.Customer.modify(customer_id, **kwargs)
+        logger.info(f"Stripe customer updated: {customer_id}")
+        self._cache_customer(customer)
+        return customer
 
+    @_stripe_call("create payment intent")
     def create_payment_intent(
         self,
-        amount: Decimal,
+        amount: Optional[Decimal] = None,
         currency: str = "usd",
         customer_id: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None,
-        description: Optional[str] = None
+        description: Optional[str] = None,
+        amount_cents: Optional[int] = None,
+        idempotency_key: Optional[str] = None
     ) -> Optional[stripe.PaymentIntent]:
         """
         Create a payment intent.
@@ -93,65 +188,62 @@ class StripeClient:
             customer_id: Stripe customer ID
             metadata: Additional metadata
             description: Payment description
+            amount_cents: Amount already in cents (takes precedence over amount)
+            idempotency_key: Key that makes retried requests safe
 
         Returns:
             Stripe PaymentIntent object or None if failed
         """
-        try:
-            # Convert dollars to cents
-            amount_cents = int(amount * 100)
-
-            params = {
-                "amount": amount_cents,
-                "currency": currency,
-                "metadata": metadata or {},
-            }
-
-            if customer_id:
-                params["customer"] = customer_id
-            if description:
-                params["description"] = description
-
-            payment_intent = stripe.PaymentIntent.create(**params)
-            logger.info(f"Payment intent created: {payment_intent.id} for ${amount}")
-            return payment_intent
-
-        except stripe.error.StripeError as e:
-            logger.error(f"Failed to create payment intent: {e}")
-            return None
-
+        if amount_cents is None:
+            if amount is None:
+                raise ValueError("Either amount or amount_cents is required")
+            amount_cents = _to_cents(amount)
+
+        params = {
+            "amount": amount_cents,
+            "currency": currency,
+            "metadata": metadata or {},
+        }
+
+        if customer_id:
+            params["customer"] = customer_id
+        if description:
+            params["description"] = description
+
+        payment_intent = stripe.PaymentIntent.create(
+            idempotency_key=idempotency_key, **params
+        )
+        logger.info(
+            f"Payment intent created: {payment_intent.id} for {amount_cents} cents"
+        )
+        return payment_intent
+
+    @_stripe_call("confirm payment intent")
     def confirm_payment_intent(
         self,
         payment_intent_id: str,
         payment_method: Optional[str] = None
     ) -> Optional[stripe.PaymentIntent]:
         """Confirm a payment intent."""
-        try:
-            params = {}
-            if payment_method:
-                params["payment_method"] = payment_method
-
-            payment_intent = stripe.PaymentIntent.confirm(payment_intent_id, **params)
-            logger.info(f"Payment intent confirmed: {payment_intent_id}")
-            return payment_intent
+        params = {}
+        if payment_method:
+            params["payment_method"] = payment_method
 
-        except stripe.error.StripeError as e:
-            logger.error(f"Failed to confirm payment intent {payment_intent_id}: {e}")
-            return None
+        payment_intent = stripe.PaymentIntent.confirm(payment_intent_id, **params)
+        logger.info(f"Payment intent confirmed: {payment_intent_id}")
+        return payment_intent
 
+    @_stripe_call("cancel payment intent")
     def cancel_payment_intent(
         self,
         payment_intent_id: str
     ) -> Optional[stripe.PaymentIntent]:
         """Cancel a payment intent."""
-        try:
-            payment_intent = stripe.PaymentIntent.cancel(payment_intent_id)
-            logger.info(f"Payment intent canceled: {payment_intent_id}")
-            return payment_intent
-        except stripe.error.StripeError as e:
-            logger.error(f"Failed to cancel payment intent {payment_intent_id}: {e}")
-            return None
+        payment_intent = stripe.PaymentIntent.cancel(payment_intent_id)
+        logger.info(f"Payment intent canceled: {payment_intent_id}")
+        return payment_intent
 
+    @_stripe_call("create subscription")
     def create_subscription(
         self,
         customer_id: str,
@@ -169,39 +261,33 @@ class StripeClient:
         Returns:
             Stripe Subscription object or None if failed
         """
-        try:
-            subscription = stripe.Subscription.create(
-                customer=customer_id,
-                items=[{"price": price_id}],
-                metadata=metadata or {}
-            )
-            logger.info(f"Subscription created: {subscription.id} for customer {customer_id}")
-            return subscription
-        except stripe.error.StripeError as e:
-            logger.error(f"Failed to create subscription: {e}")
-            return None
-
+        subscription = stripe.Subscription.create(
+            customer=customer_id,
+            items=[{"price": price_id}],
+            metadata=metadata or {}
+        )
+        logger.info(f"Subscription created: {subscription.id} for customer {customer_id}")
+        return subscription
+
+    @_stripe_call("cancel subscription")
     def cancel_subscription(
         self,
         subscription_id: str,
         at_period_end: bool = True
     ) -> Optional[stripe.Subscription]:
         """Cancel a subscription."""
-        try:
-            if at_period_end:
-                subscription = stripe.Subscription.modify(
-                    subscription_id,
-                    cancel_at_period_end=True
-                )
-            else:
-                subscription = stripe.Subscription.delete(subscription_id)
+        if at_period_end:
+            subscription = stripe.Subscription.modify(
+                subscription_id,
+                cancel_at_period_end=True
+            )
+        else:
+            subscription = stripe.Subscription.delete(subscription_id)
 
-            logger.info(f"Subscription canceled: {subscription_id}")
-            return subscription
-        except stripe.error.StripeError as e:
-            logger.error(f"Failed to cancel subscription {subscription_id}: {e}")
-            return None
+        logger.info(f"Subscription canceled: {subscription_id}")
+        return subscription
 
+    @_stripe_call("create refund")
     def create_refund(
         self,
         payment_intent_id: str,
@@ -219,20 +305,16 @@ class StripeClient:
         Returns:
             Stripe Refund object or None if failed
         """
-        try:
-            params = {"payment_intent": payment_intent_id}
-
-            if amount:
-                params["amount"] = amount
-            if reason:
-                params["reason"] = reason
-
-            refund = stripe.Refund.create(**params)
-            logger.info(f"Refund created: {refund.id} for payment {payment_intent_id}")
-            return refund
-        except stripe.error.StripeError as e:
-            logger.error(f"Failed to create refund for {payment_intent_id}: {e}")
-            return None
+        params = {"payment_intent": payment_intent_id}
+
+        if amount:
+            params["amount"] = amount
+        if reason:
+            params["reason"] = reason
+
+        refund = stripe.Refund.create(**params)
+        logger.info(f"Refund created: {refund.id} for payment {payment_intent_id}")
+        return refund
 
     def construct_webhook_event(
         self,
@@ -251,17 +333,35 @@ class StripeClient:
         Returns:
             Stripe Event object or None if verification fails
         """
+        if isinstance(payload, str):
+            payload = payload.encode()
+
+        timestamp, signatures = _parse_signature_header(sig_header or "")
+        if timestamp is None or not signatures:
+            logger.error("Invalid webhook signature: unable to parse header")
+            return None
+
+        if abs(time.time() - timestamp) > WEBHOOK_TOLERANCE_SECONDS:
+            logger.error("Invalid webhook signature: timestamp outside tolerance")
+            return None
+
+        expected = hmac.new(
+            _webhook_secret_bytes(webhook_secret),
+            f"{timestamp}.".encode() + payload,
+            hashlib.sha256,
+        ).hexdigest()
+
+        if not any(hmac.compare_digest(expected, sig) for sig in signatures):
+            logger.error("Invalid webhook signature: no matching signature")
+            return None
+
         try:
-            event = stripe.Webhook.construct_event(
-                payload, sig_header, webhook_secret
-            )
-            return event
-        except ValueError as e:
+            data = orjson.loads(payload)
+        except orjson.JSONDecodeError as e:
             logger.error(f"Invalid webhook payload: {e}")
             return None
-        except stripe.error.SignatureVerificationError as e:
-            logger.error(f"Invalid webhook signature: {e}")
-            return None
+
+        return stripe.Event.construct_from(data, stripe.api_key)
 
 
 # Global Stripe client instance
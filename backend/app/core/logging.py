@@ -9,8 +9,9 @@ import logging
 import sys
 from pathlib import Path
 from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Dict, Optional
+import orjson
 from pythonjsonlogger import jsonlogger
 
 
@@ -22,11 +23,31 @@ LOGS_DIR.mkdir(exist_ok=True)
 class CustomJsonFormatter(jsonlogger.JsonFormatter):
     """Custom JSON formatter with additional context."""
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._environment = os.getenv('ENVIRONMENT', 'development')
+        # (millisecond, formatted timestamp) of the last record seen
+        self._timestamp_cache = (-1, '')
+
+    def _format_timestamp(self, created: float) -> str:
+        """Format a record time, reusing the string for records in the same millisecond."""
+        millis = int(created * 1000)
+        cached_millis, cached_timestamp = self._timestamp_cache
+        if millis != cached_millis:
+            # Naive UTC output, matching the format logged previously
+            cached_timestamp = (
+                datetime.fromtimestamp(created, timezone.utc)
+                .replace(tzinfo=None)
+                .isoformat(timespec='milliseconds')
+            )
+            self._timestamp_cache = (millis, cached_timestamp)
+        return cached_timestamp
+
     def add_fields(self, log_record: Dict[str, Any], record: logging.LogRecord, message_dict: Dict[str, Any]):
         super().add_fields(log_record, record, message_dict)
 
         # Add timestamp
-        log_record['timestamp'] = datetime.utcnow().isoformat()
+        log_record['timestamp'] = self._format_timestamp(record.created)
 
         # Add log level
         log_record['level'] = record.levelname
@@ -43,7 +64,15 @@ class CustomJsonFormatter(jsonlogger.JsonFormatter):
             log_record['function'] = record.funcName
 
         # Add environment
-        log_record['environment'] = os.getenv('ENVIRONMENT', 'development')
+        log_record['environment'] = self._environment
+
+    def jsonify_log_record(self, log_record: Dict[str, Any]) -> str:
+        """Serialize the log record with orjson instead of stdlib json."""
+        return orjson.dumps(
+            log_record,
+            default=str,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS,
+        ).decode()
 
 
 def setup_logging(
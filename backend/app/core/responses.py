@@ -0,0 +1,30 @@
+"""
+Response helpers for serializing schemas directly to JSON bytes.
+"""
+
+from typing import Any, Iterable
+from fastapi import Response, status
+from pydantic import TypeAdapter
+
+
+def list_response(
+    adapter: TypeAdapter,
+    items: Iterable[Any],
+    status_code: int = status.HTTP_200_OK,
+) -> Response:
+    """
+    Validate ORM objects with a list adapter and return them as JSON.
+
+    Args:
+        adapter: TypeAdapter for a list of response schemas
+        items: ORM objects to serialize
+        status_code: HTTP status code
+
+    Returns:
+        Response with the serialized list
+    """
+    return Response(
+        content=adapter.dump_json(adapter.validate_python(items, from_attributes=True)),
+        media_type="application/json",
+        status_code=status_code,
+    )
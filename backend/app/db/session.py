@@ -7,6 +7,12 @@ engine = create_async_engine(
     echo=settings.DEBUG,
     pool_size=settings.DATABASE_POOL_SIZE,
     max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    # Cache compiled SQL and reuse server-side prepared statements per connection
+    query_cache_size=settings.DATABASE_QUERY_CACHE_SIZE,
+    connect_args={
+        "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+    },
 )
 
 AsyncSessionLocal = sessionmaker(
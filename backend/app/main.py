@@ -1,14 +1,26 @@
+import asyncio
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from app.core.config import settings
 from app.api.api_v1.api import api_router
+from app.core.cache import redis_client
+from app.core.integrations.sendgrid_client import sendgrid_client
+from app.db.session import AsyncSessionLocal
+from app.services.auth_service import AuthService
+from app.services.member_service import MemberService
+from app.services.payment_service import PaymentService
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title=settings.APP_NAME,
     openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
     docs_url=f"{settings.API_V1_PREFIX}/docs",
     redoc_url=f"{settings.API_V1_PREFIX}/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -27,6 +39,56 @@ app.add_middleware(GZipMiddleware, minimum_size=1000)
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
 
+async def run_periodically(interval_seconds: int, job, description: str):
+    """Run a database job on a fixed interval until cancelled."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            async with AsyncSessionLocal() as db:
+                await job(db)
+        except Exception as e:
+            logger.error(f"Failed to {description}: {e}")
+
+
+@app.on_event("startup")
+async def startup():
+    app.state.background_tasks = [
+        asyncio.create_task(
+            run_periodically(
+                settings.DASHBOARD_STATS_REFRESH_SECONDS,
+                MemberService.refresh_dashboard_stats,
+                "refresh dashboard stats",
+            )
+        ),
+        asyncio.create_task(
+            run_periodically(
+                settings.LAST_LOGIN_FLUSH_SECONDS,
+                AuthService.flush_last_logins,
+                "flush last logins",
+            )
+        ),
+    ]
+
+    if settings.PAYMENT_RETRY_JOB_ENABLED:
+        app.state.background_tasks.append(
+            asyncio.create_task(
+                run_periodically(
+                    settings.PAYMENT_RETRY_INTERVAL_SECONDS,
+                    PaymentService.retry_failed_payments,
+                    "retry failed payments",
+                )
+            )
+        )
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    for task in app.state.background_tasks:
+        task.cancel()
+    await sendgrid_client.aclose()
+    await redis_client.aclose()
+
+
 @app.get("/")
 async def root():
     return {
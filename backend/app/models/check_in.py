@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, Integer, ForeignKey, String
+from sqlalchemy import Column, DateTime, Integer, ForeignKey, String, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base
@@ -6,10 +6,20 @@ from app.db.base import Base
 
 class CheckIn(Base):
     __tablename__ = "check_ins"
+    __table_args__ = (
+        # Open check-ins (not yet checked out)
+        Index(
+            "ix_check_ins_active",
+            "id",
+            postgresql_where=text("check_out_time IS NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     member_id = Column(Integer, ForeignKey("members.id"), nullable=False)
-    check_in_time = Column(DateTime(timezone=True), server_default=func.now())
+    check_in_time = Column(
+        DateTime(timezone=True), server_default=func.now(), index=True
+    )
     check_out_time = Column(DateTime(timezone=True), nullable=True)
     method = Column(String, nullable=True)  # qr_code, manual, biometric
     notes = Column(String, nullable=True)
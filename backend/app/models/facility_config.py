@@ -2,8 +2,8 @@
 Facility configuration model for configurable gym settings.
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, JSON
-from datetime import datetime
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, JSON, event
+from sqlalchemy.sql import func
 
 from app.db.base import Base
 
@@ -63,12 +63,32 @@ class FacilityConfig(Base):
     is_active = Column(Boolean, default=True, nullable=False)
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    # Per-hour capacity lookup, rebuilt after capacity settings change
+    _capacity_by_hour = None
 
     def __repr__(self):
         return f"<FacilityConfig(name='{self.name}', capacity={self.total_capacity})>"
 
+    def _build_capacity_by_hour(self) -> tuple:
+        """Build the 24-entry capacity table from the peak hours settings."""
+        default = self.total_capacity
+        peak = self.peak_hours_capacity or {}
+        night = peak.get("night", default)
+        morning = peak.get("morning", default)
+        afternoon = peak.get("afternoon", default)
+        evening = peak.get("evening", default)
+
+        # 0-4 night, 5-11 morning, 12-16 afternoon, 17-21 evening, 22-23 night
+        return (
+            (night,) * 5 + (morning,) * 7 + (afternoon,) * 5
+            + (evening,) * 5 + (night,) * 2
+        )
+
     def get_current_capacity(self, hour: int = None) -> int:
         """
         Get the capacity for a specific hour, accounting for peak hours.
@@ -78,21 +98,20 @@ class FacilityConfig(Base):
 
         Returns:
             Adjusted capacity
+
+        Raises:
+            ValueError: If hour is outside 0-23
         """
-        if hour is None or not self.peak_hours_capacity:
+        if hour is None:
             return self.total_capacity
+        if not 0 <= hour <= 23:
+            raise ValueError(f"hour must be between 0 and 23, got {hour}")
 
-        # Determine time period
-        if 5 <= hour < 12:
-            period = "morning"
-        elif 12 <= hour < 17:
-            period = "afternoon"
-        elif 17 <= hour < 22:
-            period = "evening"
-        else:
-            period = "night"
+        capacity_by_hour = self._capacity_by_hour
+        if capacity_by_hour is None:
+            capacity_by_hour = self._capacity_by_hour = self._build_capacity_by_hour()
 
-        return self.peak_hours_capacity.get(period, self.total_capacity)
+        return capacity_by_hour[hour]
 
     def is_over_capacity(self, current_occupancy: int, hour: int = None) -> bool:
         """Check if facility is over capacity."""
@@ -111,3 +130,14 @@ class FacilityConfig(Base):
 
         occupancy_pct = self.get_occupancy_percentage(current_occupancy, hour) / 100
         return occupancy_pct >= self.occupancy_alert_threshold
+
+
+def _reset_capacity_by_hour(target, *args):
+    """Drop the cached capacity table when its inputs change."""
+    target._capacity_by_hour = None
+
+
+event.listen(FacilityConfig.total_capacity, "set", _reset_capacity_by_hour)
+event.listen(FacilityConfig.peak_hours_capacity, "set", _reset_capacity_by_hour)
+event.listen(FacilityConfig, "refresh", _reset_capacity_by_hour)
+event.listen(FacilityConfig, "expire", _reset_capacity_by_hour)
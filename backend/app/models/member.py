@@ -8,10 +8,17 @@ from sqlalchemy import (
     Date,
     Text,
     Enum as SQLEnum,
+    Index,
+    and_,
+    literal_column,
+    or_,
+    text,
 )
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base
+from datetime import date
 import enum
 
 
@@ -24,6 +31,14 @@ class MembershipStatus(str, enum.Enum):
 
 class Member(Base):
     __tablename__ = "members"
+    __table_args__ = (
+        # Supports is_membership_active filtering
+        Index(
+            "ix_members_active_end_date",
+            "membership_end_date",
+            postgresql_where=text("membership_status = 'active'"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, unique=True)
@@ -31,9 +46,15 @@ class Member(Base):
         Integer, ForeignKey("membership_plans.id"), nullable=True
     )
     membership_status = Column(
-        SQLEnum(MembershipStatus, name="membership_status"),
+        # Store the lowercase values, matching the type created in migration 002
+        SQLEnum(
+            MembershipStatus,
+            name="membership_status",
+            values_callable=lambda e: [m.value for m in e],
+        ),
         default=MembershipStatus.ACTIVE,
         nullable=False,
+        index=True,
     )
     membership_start_date = Column(Date, nullable=True)
     membership_end_date = Column(Date, nullable=True)
@@ -66,9 +87,28 @@ class Member(Base):
     )
 
     # Relationships
-    user = relationship("User", backref="member_profile")
-    membership_plan = relationship("MembershipPlan")
+    user = relationship("User", backref="member_profile", lazy="raise_on_sql")
+    membership_plan = relationship("MembershipPlan", lazy="raise_on_sql")
     payments = relationship("Payment", back_populates="member", cascade="all, delete-orphan")
 
+    @hybrid_property
+    def is_membership_active(self) -> bool:
+        """Active status with a membership that has not yet ended."""
+        return self.membership_status == MembershipStatus.ACTIVE and (
+            self.membership_end_date is None
+            or self.membership_end_date >= date.today()
+        )
+
+    @is_membership_active.expression
+    def is_membership_active(cls):
+        return and_(
+            # Inlined so generic plans can still match ix_members_active_end_date
+            cls.membership_status == literal_column("'active'"),
+            or_(
+                cls.membership_end_date.is_(None),
+                cls.membership_end_date >= func.current_date(),
+            ),
+        )
+
     def __repr__(self):
         return f"<Member {self.user_id}>"
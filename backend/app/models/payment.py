@@ -2,9 +2,21 @@
 Payment model for tracking member payments and transactions.
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import (
+    CheckConstraint,
+    Column,
+    Integer,
+    String,
+    Numeric,
+    DateTime,
+    ForeignKey,
+    Index,
+    Enum as SQLEnum,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
-from datetime import datetime
+from sqlalchemy.sql import func
 import enum
 
 from app.db.base import Base
@@ -39,11 +51,33 @@ class Payment(Base):
     """
 
     __tablename__ = "payments"
+    __table_args__ = (
+        Index("ix_payments_status_created_at", "status", "created_at"),
+        Index("ix_payments_member_status", "member_id", "status"),
+        Index(
+            "ix_payments_member_created_at",
+            "member_id",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        # Failed payments still eligible for retry
+        Index(
+            "ix_payments_retry_due",
+            "next_retry_at",
+            postgresql_where=text("status = 'failed' AND retry_count < 5"),
+        ),
+        CheckConstraint(
+            "status IN ({})".format(", ".join(f"'{s.value}'" for s in PaymentStatus)),
+            name="ck_payments_status",
+        ),
+    )
+    # Fetch server-generated timestamps via RETURNING on INSERT and UPDATE
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
 
     # Member relationship
-    member_id = Column(Integer, ForeignKey("members.id"), nullable=False)
+    member_id = Column(Integer, ForeignKey("members.id"), nullable=False, index=True)
     member = relationship("Member", back_populates="payments")
 
     # Stripe integration
@@ -52,9 +86,15 @@ class Payment(Base):
     stripe_charge_id = Column(String, unique=True, nullable=True)
 
     # Payment details
-    amount = Column(Float, nullable=False)  # Amount in USD
+    amount = Column(Numeric(12, 2), nullable=False)  # Amount in USD
     currency = Column(String, default="usd", nullable=False)
-    status = Column(SQLEnum(PaymentStatus), default=PaymentStatus.PENDING, nullable=False)
+    # Stored as plain text (validated by ck_payments_status); see PaymentStatus
+    status = Column(
+        String(16),
+        default=PaymentStatus.PENDING.value,
+        server_default=PaymentStatus.PENDING.value,
+        nullable=False,
+    )
     payment_method = Column(SQLEnum(PaymentMethod), nullable=False)
 
     # Payment metadata
@@ -69,13 +109,15 @@ class Payment(Base):
     failure_reason = Column(String, nullable=True)
     failure_code = Column(String, nullable=True)
     retry_count = Column(Integer, default=0)
-    next_retry_at = Column(DateTime, nullable=True)
+    next_retry_at = Column(DateTime(timezone=True), nullable=True)
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    paid_at = Column(DateTime, nullable=True)
-    refunded_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+    paid_at = Column(DateTime(timezone=True), nullable=True)
+    refunded_at = Column(DateTime(timezone=True), nullable=True)
 
     def __repr__(self):
         return f"<Payment(id={self.id}, member_id={self.member_id}, amount=${self.amount}, status={self.status})>"
@@ -87,6 +129,14 @@ class PaymentHistory(Base):
     """
 
     __tablename__ = "payment_history"
+    __table_args__ = (
+        Index(
+            "ix_payment_history_metadata_gin",
+            "metadata",
+            postgresql_using="gin",
+            postgresql_ops={"metadata": "jsonb_path_ops"},
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -99,12 +149,12 @@ class PaymentHistory(Base):
     previous_status = Column(String, nullable=True)
     new_status = Column(String, nullable=True)
 
-    # Event metadata
-    metadata = Column(String, nullable=True)  # JSON string for additional data
+    # Event metadata ("metadata" is reserved on declarative models)
+    event_metadata = Column("metadata", JSONB, nullable=True)
     notes = Column(String, nullable=True)
 
     # Timestamp
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     def __repr__(self):
         return f"<PaymentHistory(id={self.id}, payment_id={self.payment_id}, event={self.event_type})>"
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, TypeAdapter
+from typing import List, Optional
 from datetime import datetime, date
 from app.models.member import MembershipStatus
 
@@ -100,3 +100,14 @@ class CheckInResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# Build validators at import time rather than on the first request
+MembershipPlanResponse.model_rebuild()
+MemberResponse.model_rebuild()
+CheckInResponse.model_rebuild()
+
+# List validators compiled once for list endpoints
+MembershipPlanResponseListAdapter = TypeAdapter(List[MembershipPlanResponse])
+MemberResponseListAdapter = TypeAdapter(List[MemberResponse])
+CheckInResponseListAdapter = TypeAdapter(List[CheckInResponse])
@@ -53,3 +53,8 @@ class TokenPayload(BaseModel):
     sub: int
     exp: datetime
     type: str
+
+
+# Build validators at import time rather than on the first request
+UserResponse.model_rebuild()
+TokenResponse.model_rebuild()
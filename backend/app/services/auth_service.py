@@ -1,8 +1,12 @@
-from datetime import datetime
+import asyncio
+import logging
+from datetime import datetime, timezone
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import DateTime, Integer, column, exists, func, insert, select, update, values
 from fastapi import HTTPException, status
+from redis.exceptions import LockError, RedisError, ResponseError
+from app.core.cache import redis_client
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin, TokenResponse
 from app.core.security import (
@@ -12,6 +16,15 @@ from app.core.security import (
     create_refresh_token,
 )
 
+logger = logging.getLogger(__name__)
+
+# Pending last-login timestamps (user_id -> ISO timestamp), flushed in batches
+LAST_LOGIN_PENDING_KEY = "last_login_pending"
+LAST_LOGIN_FLUSHING_KEY = "last_login_flushing"
+# Held while a worker flushes, so only one flush runs at a time
+LAST_LOGIN_FLUSH_LOCK_KEY = "last_login_flush:lock"
+LAST_LOGIN_FLUSH_LOCK_TIMEOUT_SECONDS = 60
+
 
 class AuthService:
     @staticmethod
@@ -19,31 +32,31 @@ class AuthService:
         db: AsyncSession, user_data: UserCreate
     ) -> User:
         """Register a new user."""
-        # Check if user already exists
-        result = await db.execute(
-            select(User).where(User.email == user_data.email)
-        )
-        existing_user = result.scalar_one_or_none()
-
-        if existing_user:
+        # Check if user already exists (before spending time on hashing)
+        if await db.scalar(select(exists().where(User.email == user_data.email))):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered",
             )
 
         # Create new user
-        hashed_password = get_password_hash(user_data.password)
-        db_user = User(
-            email=user_data.email,
-            hashed_password=hashed_password,
-            full_name=user_data.full_name,
-            phone_number=user_data.phone_number,
-            role=user_data.role,
+        # bcrypt is CPU-bound; hash in a worker thread to keep the event loop free
+        hashed_password = await asyncio.to_thread(
+            get_password_hash, user_data.password
         )
-
-        db.add(db_user)
+        result = await db.execute(
+            insert(User)
+            .values(
+                email=user_data.email,
+                hashed_password=hashed_password,
+                full_name=user_data.full_name,
+                phone_number=user_data.phone_number,
+                role=user_data.role,
+            )
+            .returning(User)
+        )
+        db_user = result.scalar_one()
         await db.commit()
-        await db.refresh(db_user)
 
         return db_user
 
@@ -60,15 +73,80 @@ class AuthService:
         if not user:
             return None
 
-        if not verify_password(credentials.password, user.hashed_password):
+        password_ok = await asyncio.to_thread(
+            verify_password, credentials.password, user.hashed_password
+        )
+        if not password_ok:
             return None
 
-        # Update last login
-        user.last_login = datetime.utcnow()
-        await db.commit()
+        # Buffer the last login update; flush_last_logins writes it in batches
+        user.last_login = datetime.now(timezone.utc)
+        try:
+            await redis_client.hset(
+                LAST_LOGIN_PENDING_KEY, str(user.id), user.last_login.isoformat()
+            )
+        except RedisError as e:
+            logger.warning(f"Could not buffer last login for user {user.id}: {e}")
+            await db.commit()
 
         return user
 
+    @staticmethod
+    async def flush_last_logins(db: AsyncSession) -> int:
+        """
+        Write buffered last-login timestamps in a single UPDATE.
+
+        Workers serialise on a Redis lock; a worker that finds a flush in
+        progress skips this round.
+
+        Returns:
+            Number of users updated
+        """
+        lock = redis_client.lock(
+            LAST_LOGIN_FLUSH_LOCK_KEY, timeout=LAST_LOGIN_FLUSH_LOCK_TIMEOUT_SECONDS
+        )
+        if not await lock.acquire(blocking=False):
+            return 0
+
+        try:
+            # Move the pending hash aside so new logins are buffered separately.
+            # A batch left over from a failed flush is retried first.
+            if not await redis_client.exists(LAST_LOGIN_FLUSHING_KEY):
+                try:
+                    await redis_client.rename(
+                        LAST_LOGIN_PENDING_KEY, LAST_LOGIN_FLUSHING_KEY
+                    )
+                except ResponseError:
+                    # Nothing pending
+                    return 0
+
+            pending = await redis_client.hgetall(LAST_LOGIN_FLUSHING_KEY)
+            if pending:
+                data = values(
+                    column("id", Integer),
+                    column("last_login", DateTime(timezone=True)),
+                    name="data",
+                ).data([
+                    (int(user_id), datetime.fromisoformat(timestamp.decode()))
+                    for user_id, timestamp in pending.items()
+                ])
+                # Never move last_login backwards (e.g. a retried older batch)
+                await db.execute(
+                    update(User)
+                    .where(User.id == data.c.id)
+                    .values(last_login=func.greatest(User.last_login, data.c.last_login))
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+
+            await redis_client.delete(LAST_LOGIN_FLUSHING_KEY)
+            return len(pending)
+        finally:
+            try:
+                await lock.release()
+            except LockError:
+                logger.warning("Last-login flush lock expired before release")
+
     @staticmethod
     def create_tokens(user: User) -> TokenResponse:
         """Create access and refresh tokens for user."""
@@ -1,13 +1,32 @@
 import uuid
-from datetime import datetime, timedelta, date
+import logging
+from collections import Counter
+from datetime import datetime, timedelta, date, time, timezone
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import (
+    Integer,
+    column,
+    func,
+    insert,
+    literal,
+    select,
+    text,
+    true,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.orm import raiseload
 from fastapi import HTTPException, status
+from redis.exceptions import RedisError
+from app.core.cache import redis_client, cache_get_json, cache_set_json, cache_delete
+from app.core.config import settings
 from app.models.member import Member, MembershipStatus
 from app.models.membership_plan import MembershipPlan
 from app.models.check_in import CheckIn
-from app.models.user import User
+from app.services.membership_plan_service import MembershipPlanService
 from app.schemas.member import (
     MemberCreate,
     MemberUpdate,
@@ -15,6 +34,23 @@ from app.schemas.member import (
     CheckOutUpdate,
 )
 
+logger = logging.getLogger(__name__)
+
+# Dashboard stats come from mv_dashboard_stats and can lag writes by up to
+# DASHBOARD_STATS_REFRESH_SECONDS; the cache is cleared only on refresh
+DASHBOARD_STATS_CACHE_KEY = "dashboard:stats"
+DASHBOARD_STATS_LOCK_KEY = "dashboard:stats:lock"
+DASHBOARD_STATS_CACHE_TTL_SECONDS = 20
+# Claimed by the worker refreshing the view; expires before the next interval
+DASHBOARD_STATS_REFRESH_LOCK_KEY = "dashboard:stats:refresh_lock"
+
+# Postgres default names of the members foreign keys
+_MEMBER_PLAN_FK = "members_membership_plan_id_fkey"
+_MEMBER_USER_FK = "members_user_id_fkey"
+
+# MemberResponse serializes no relationships; any lazy load raises
+_MEMBER_LOAD_OPTIONS = (raiseload("*"),)
+
 
 class MemberService:
     @staticmethod
@@ -22,64 +58,118 @@ class MemberService:
         db: AsyncSession, member_data: MemberCreate
     ) -> Member:
         """Create a new member profile."""
-        # Check if user exists
-        result = await db.execute(
-            select(User).where(User.id == member_data.user_id)
-        )
-        user = result.scalar_one_or_none()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found",
+        row = member_data.model_dump()
+
+        # Generate QR code
+        row["qr_code"] = str(uuid.uuid4())
+
+        # If membership plan is provided, derive dates from it in the same statement
+        if member_data.membership_plan_id:
+            row["membership_start_date"] = func.current_date()
+            row["membership_end_date"] = func.current_date() + (
+                select(MembershipPlan.duration_days)
+                .where(MembershipPlan.id == member_data.membership_plan_id)
+                .scalar_subquery()
             )
 
-        # Check if member profile already exists
-        result = await db.execute(
-            select(Member).where(Member.user_id == member_data.user_id)
+        # The unique index on user_id replaces a separate existence check,
+        # and the foreign key replaces the user lookup
+        stmt = (
+            pg_insert(Member)
+            .values(**row)
+            .on_conflict_do_nothing(index_elements=[Member.user_id])
+            .returning(Member)
         )
-        existing_member = result.scalar_one_or_none()
-        if existing_member:
+
+        try:
+            result = await db.execute(stmt)
+        except IntegrityError as e:
+            await db.rollback()
+            # asyncpg's exception (with constraint_name) is the DBAPI error's cause
+            constraint = getattr(e.orig.__cause__, "constraint_name", None)
+            if constraint == _MEMBER_PLAN_FK:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Membership plan not found",
+                )
+            if constraint == _MEMBER_USER_FK:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="User not found",
+                )
+            raise
+
+        db_member = result.scalar_one_or_none()
+        if db_member is None:
+            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Member profile already exists for this user",
             )
 
-        # Generate QR code
-        qr_code = str(uuid.uuid4())
+        await db.commit()
 
-        # Create member
-        db_member = Member(
-            **member_data.model_dump(),
-            qr_code=qr_code,
-        )
+        return db_member
 
-        # If membership plan is provided, set dates
-        if member_data.membership_plan_id:
+    @staticmethod
+    async def create_members_bulk(
+        db: AsyncSession, members_data: List[MemberCreate]
+    ) -> List[Member]:
+        """
+        Create many member profiles in one round-trip.
+
+        Users that already have a member profile are skipped.
+        """
+        if not members_data:
+            return []
+
+        # Resolve plan durations once for the whole batch
+        plan_ids = {m.membership_plan_id for m in members_data if m.membership_plan_id}
+        durations = {}
+        if plan_ids:
             result = await db.execute(
-                select(MembershipPlan).where(
-                    MembershipPlan.id == member_data.membership_plan_id
+                select(MembershipPlan.id, MembershipPlan.duration_days).where(
+                    MembershipPlan.id.in_(plan_ids)
                 )
             )
-            plan = result.scalar_one_or_none()
-            if plan:
-                db_member.membership_start_date = date.today()
-                db_member.membership_end_date = date.today() + timedelta(
-                    days=plan.duration_days
-                )
+            durations = dict(result.all())
+
+        today = date.today()
+        rows = []
+        for member_data in members_data:
+            duration = durations.get(member_data.membership_plan_id)
+            rows.append({
+                **member_data.model_dump(),
+                "qr_code": str(uuid.uuid4()),
+                "membership_start_date": today if duration is not None else None,
+                "membership_end_date": (
+                    today + timedelta(days=duration) if duration is not None else None
+                ),
+            })
+
+        try:
+            result = await db.execute(
+                pg_insert(Member)
+                .on_conflict_do_nothing(index_elements=[Member.user_id])
+                .returning(Member),
+                rows,
+            )
+            members = list(result.scalars().all())
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="One or more users or membership plans not found",
+            )
 
-        db.add(db_member)
         await db.commit()
-        await db.refresh(db_member)
 
-        return db_member
+        return members
 
     @staticmethod
     async def get_member(db: AsyncSession, member_id: int) -> Optional[Member]:
         """Get member by ID."""
-        result = await db.execute(
-            select(Member).where(Member.id == member_id)
-        )
-        return result.scalar_one_or_none()
+        return await db.get(Member, member_id, options=_MEMBER_LOAD_OPTIONS)
 
     @staticmethod
     async def get_member_by_user_id(
@@ -87,16 +177,21 @@ class MemberService:
     ) -> Optional[Member]:
         """Get member by user ID."""
         result = await db.execute(
-            select(Member).where(Member.user_id == user_id)
+            select(Member)
+            .options(*_MEMBER_LOAD_OPTIONS)
+            .where(Member.user_id == user_id)
         )
         return result.scalar_one_or_none()
 
     @staticmethod
     async def get_members(
-        db: AsyncSession, skip: int = 0, limit: int = 100
+        db: AsyncSession, skip: int = 0, limit: int = 100, active_only: bool = False
     ) -> List[Member]:
         """Get all members."""
-        result = await db.execute(select(Member).offset(skip).limit(limit))
+        query = select(Member).options(*_MEMBER_LOAD_OPTIONS)
+        if active_only:
+            query = query.where(Member.is_membership_active)
+        result = await db.execute(query.offset(skip).limit(limit))
         return result.scalars().all()
 
     @staticmethod
@@ -104,34 +199,35 @@ class MemberService:
         db: AsyncSession, member_id: int, member_data: MemberUpdate
     ) -> Optional[Member]:
         """Update member profile."""
-        result = await db.execute(
-            select(Member).where(Member.id == member_id)
-        )
-        member = result.scalar_one_or_none()
-
-        if not member:
-            return None
-
-        # Update fields
-        for field, value in member_data.model_dump(exclude_unset=True).items():
-            setattr(member, field, value)
+        changes = member_data.model_dump(exclude_unset=True)
 
         # Update membership dates if plan changed
         if member_data.membership_plan_id:
-            result = await db.execute(
-                select(MembershipPlan).where(
-                    MembershipPlan.id == member_data.membership_plan_id
-                )
+            plan = await MembershipPlanService.get_plan_cached(
+                db, member_data.membership_plan_id
             )
-            plan = result.scalar_one_or_none()
             if plan:
-                member.membership_start_date = date.today()
-                member.membership_end_date = date.today() + timedelta(
+                changes["membership_start_date"] = date.today()
+                changes["membership_end_date"] = date.today() + timedelta(
                     days=plan.duration_days
                 )
 
+        if not changes:
+            return await MemberService.get_member(db, member_id)
+
+        result = await db.execute(
+            update(Member)
+            .where(Member.id == member_id)
+            .values(**changes)
+            .returning(Member)
+            .execution_options(populate_existing=True)
+        )
+        member = result.scalar_one_or_none()
+
+        if not member:
+            return None
+
         await db.commit()
-        await db.refresh(member)
 
         return member
 
@@ -140,86 +236,227 @@ class MemberService:
         db: AsyncSession, check_in_data: CheckInCreate
     ) -> CheckIn:
         """Check in a member."""
-        # Verify member exists
+        # Member stats are bumped by a writable CTE in the same statement;
+        # both the INSERT and the UPDATE match no rows for an unknown member
+        member_stats = (
+            update(Member)
+            .where(Member.id == check_in_data.member_id)
+            .values(
+                total_check_ins=Member.total_check_ins + 1,
+                last_check_in=func.now(),
+            )
+            .returning(Member.id)
+            .cte("member_stats")
+        )
         result = await db.execute(
-            select(Member).where(Member.id == check_in_data.member_id)
+            insert(CheckIn)
+            .from_select(
+                ["member_id", "method", "notes"],
+                select(
+                    Member.id,
+                    literal(check_in_data.method, CheckIn.method.type),
+                    literal(check_in_data.notes, CheckIn.notes.type),
+                ).where(Member.id == check_in_data.member_id),
+            )
+            .returning(CheckIn)
+            .add_cte(member_stats)
         )
-        member = result.scalar_one_or_none()
+        check_in = result.scalar_one_or_none()
 
-        if not member:
+        if not check_in:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Member not found",
             )
 
-        # Create check-in
-        check_in = CheckIn(**check_in_data.model_dump())
-        db.add(check_in)
+        await db.commit()
+
+        return check_in
 
-        # Update member stats
-        member.total_check_ins += 1
-        member.last_check_in = datetime.utcnow()
+    @staticmethod
+    async def check_in_members_bulk(
+        db: AsyncSession, check_ins_data: List[CheckInCreate]
+    ) -> List[CheckIn]:
+        """Check in many members with one INSERT and one stats UPDATE."""
+        if not check_ins_data:
+            return []
+
+        try:
+            result = await db.execute(
+                insert(CheckIn).returning(CheckIn),
+                [check_in_data.model_dump() for check_in_data in check_ins_data],
+            )
+            check_ins = list(result.scalars().all())
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Member not found",
+            )
+
+        # Update member stats for the whole batch
+        counts = values(
+            column("member_id", Integer),
+            column("check_ins", Integer),
+            name="counts",
+        ).data(
+            list(Counter(c.member_id for c in check_ins_data).items())
+        )
+        await db.execute(
+            update(Member)
+            .where(Member.id == counts.c.member_id)
+            .values(
+                total_check_ins=Member.total_check_ins + counts.c.check_ins,
+                last_check_in=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
 
         await db.commit()
-        await db.refresh(check_in)
 
-        return check_in
+        return check_ins
 
     @staticmethod
     async def check_out_member(
         db: AsyncSession, check_in_id: int, check_out_data: CheckOutUpdate
     ) -> Optional[CheckIn]:
         """Check out a member."""
+        changes = {"check_out_time": func.now()}
+        if check_out_data.notes:
+            changes["notes"] = check_out_data.notes
+
         result = await db.execute(
-            select(CheckIn).where(CheckIn.id == check_in_id)
+            update(CheckIn)
+            .where(CheckIn.id == check_in_id)
+            .values(**changes)
+            .returning(CheckIn)
+            .execution_options(populate_existing=True)
         )
         check_in = result.scalar_one_or_none()
 
         if not check_in:
             return None
 
-        check_in.check_out_time = datetime.utcnow()
-        if check_out_data.notes:
-            check_in.notes = check_out_data.notes
-
         await db.commit()
-        await db.refresh(check_in)
 
         return check_in
 
     @staticmethod
     async def get_dashboard_stats(db: AsyncSession) -> dict:
-        """Get dashboard statistics."""
-        # Total members
-        total_members = await db.execute(select(func.count(Member.id)))
-        total_members = total_members.scalar()
-
-        # Active members
-        active_members = await db.execute(
-            select(func.count(Member.id)).where(
-                Member.membership_status == MembershipStatus.ACTIVE
+        """
+        Get dashboard statistics, cached briefly in Redis.
+
+        Check-ins are not reflected until the next view refresh.
+        """
+        stats = await cache_get_json(DASHBOARD_STATS_CACHE_KEY)
+        if stats is not None:
+            return stats
+
+        # Single-flight: one request recomputes while concurrent ones wait
+        try:
+            async with redis_client.lock(
+                DASHBOARD_STATS_LOCK_KEY, timeout=5, blocking_timeout=5
+            ):
+                stats = await cache_get_json(DASHBOARD_STATS_CACHE_KEY)
+                if stats is None:
+                    stats = await MemberService._read_dashboard_stats(db)
+                    await cache_set_json(
+                        DASHBOARD_STATS_CACHE_KEY,
+                        stats,
+                        DASHBOARD_STATS_CACHE_TTL_SECONDS,
+                    )
+        except RedisError as e:
+            logger.warning(f"Dashboard stats lock unavailable: {e}")
+
+        if stats is None:
+            stats = await MemberService._read_dashboard_stats(db)
+
+        return stats
+
+    @staticmethod
+    async def _read_dashboard_stats(db: AsyncSession) -> dict:
+        """
+        Read dashboard statistics from the periodically refreshed view.
+
+        Falls back to computing them live if the view is missing or has
+        not been populated yet.
+        """
+        try:
+            async with db.begin_nested():
+                result = await db.execute(
+                    text(
+                        "SELECT total_members, active_members, today_check_ins, "
+                        "active_check_ins FROM mv_dashboard_stats"
+                    )
+                )
+                return dict(result.one()._mapping)
+        except DBAPIError as e:
+            logger.warning(f"Dashboard stats view unavailable, computing live: {e}")
+
+        return await MemberService.get_live_dashboard_stats(db)
+
+    @staticmethod
+    async def refresh_dashboard_stats(db: AsyncSession) -> None:
+        """
+        Refresh the dashboard stats view without blocking readers.
+
+        Every worker schedules this job; the first to claim the Redis lock
+        for the current interval refreshes and the others skip.
+        """
+        try:
+            claimed = await redis_client.set(
+                DASHBOARD_STATS_REFRESH_LOCK_KEY,
+                1,
+                nx=True,
+                ex=max(settings.DASHBOARD_STATS_REFRESH_SECONDS - 1, 1),
             )
+        except RedisError as e:
+            logger.warning(f"Dashboard stats refresh lock unavailable: {e}")
+            claimed = True
+
+        if not claimed:
+            return
+
+        await db.execute(
+            text("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_dashboard_stats")
         )
-        active_members = active_members.scalar()
+        await db.commit()
+        await cache_delete(DASHBOARD_STATS_CACHE_KEY)
 
-        # Today's check-ins
-        today = datetime.utcnow().date()
-        today_check_ins = await db.execute(
-            select(func.count(CheckIn.id)).where(
-                func.date(CheckIn.check_in_time) == today
-            )
+    @staticmethod
+    async def get_live_dashboard_stats(db: AsyncSession) -> dict:
+        """Get dashboard statistics computed directly from the tables."""
+        # Half-open range keeps the predicate index-friendly on check_in_time
+        today_start = datetime.combine(
+            datetime.now(timezone.utc).date(), time.min, tzinfo=timezone.utc
         )
-        today_check_ins = today_check_ins.scalar()
+        tomorrow_start = today_start + timedelta(days=1)
+
+        # Total and active members in one pass over members
+        member_counts = select(
+            func.count(Member.id).label("total_members"),
+            func.count(Member.id)
+            .filter(Member.membership_status == MembershipStatus.ACTIVE)
+            .label("active_members"),
+        ).subquery()
+
+        # Today's and active (not checked out) check-ins in one pass over check_ins
+        check_in_counts = select(
+            func.count(CheckIn.id)
+            .filter(
+                CheckIn.check_in_time >= today_start,
+                CheckIn.check_in_time < tomorrow_start,
+            )
+            .label("today_check_ins"),
+            func.count(CheckIn.id)
+            .filter(CheckIn.check_out_time.is_(None))
+            .label("active_check_ins"),
+        ).subquery()
 
-        # Active check-ins (not checked out)
-        active_check_ins = await db.execute(
-            select(func.count(CheckIn.id)).where(CheckIn.check_out_time.is_(None))
+        result = await db.execute(
+            select(member_counts, check_in_counts).select_from(
+                member_counts.join(check_in_counts, true())
+            )
         )
-        active_check_ins = active_check_ins.scalar()
-
-        return {
-            "total_members": total_members,
-            "active_members": active_members,
-            "today_check_ins": today_check_ins,
-            "active_check_ins": active_check_ins,
-        }
+
+        return dict(result.one()._mapping)
@@ -1,8 +1,31 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
+from app.core.cache import (
+    cache_get_json,
+    cache_set_json,
+    cache_delete,
+    cache_delete_pattern,
+)
 from app.models.membership_plan import MembershipPlan
-from app.schemas.member import MembershipPlanCreate, MembershipPlanUpdate
+from app.schemas.member import (
+    MembershipPlanCreate,
+    MembershipPlanUpdate,
+    MembershipPlanResponse,
+)
+
+# Plans are admin-managed and change rarely
+PLAN_CACHE_TTL_SECONDS = 3600
+PLAN_LIST_CACHE_TTL_SECONDS = 300
+PLAN_LIST_CACHE_PATTERN = "plans:*"
+
+
+def _plan_cache_key(plan_id: int) -> str:
+    return f"plan:{plan_id}"
+
+
+def _active_plans_cache_key(skip: int, limit: int) -> str:
+    return f"plans:active:{skip}:{limit}"
 
 
 class MembershipPlanService:
@@ -15,6 +38,7 @@ class MembershipPlanService:
         db.add(db_plan)
         await db.commit()
         await db.refresh(db_plan)
+        await cache_delete_pattern(PLAN_LIST_CACHE_PATTERN)
         return db_plan
 
     @staticmethod
@@ -22,10 +46,28 @@ class MembershipPlanService:
         db: AsyncSession, plan_id: int
     ) -> Optional[MembershipPlan]:
         """Get membership plan by ID."""
-        result = await db.execute(
-            select(MembershipPlan).where(MembershipPlan.id == plan_id)
+        return await db.get(MembershipPlan, plan_id)
+
+    @staticmethod
+    async def get_plan_cached(
+        db: AsyncSession, plan_id: int
+    ) -> Optional[MembershipPlanResponse]:
+        """Get a read-only snapshot of a membership plan, cached in Redis."""
+        cached = await cache_get_json(_plan_cache_key(plan_id))
+        if cached is not None:
+            return MembershipPlanResponse.model_validate(cached)
+
+        plan = await MembershipPlanService.get_plan(db, plan_id)
+        if not plan:
+            return None
+
+        snapshot = MembershipPlanResponse.model_validate(plan)
+        await cache_set_json(
+            _plan_cache_key(plan_id),
+            snapshot.model_dump(mode="json"),
+            PLAN_CACHE_TTL_SECONDS,
         )
-        return result.scalar_one_or_none()
+        return snapshot
 
     @staticmethod
     async def get_plans(
@@ -39,37 +81,66 @@ class MembershipPlanService:
         result = await db.execute(query)
         return result.scalars().all()
 
+    @staticmethod
+    async def get_active_plans_cached(
+        db: AsyncSession, skip: int = 0, limit: int = 100
+    ) -> List[MembershipPlanResponse]:
+        """Get read-only snapshots of active membership plans, cached in Redis."""
+        cache_key = _active_plans_cache_key(skip, limit)
+        cached = await cache_get_json(cache_key)
+        if cached is not None:
+            return [MembershipPlanResponse.model_validate(p) for p in cached]
+
+        plans = await MembershipPlanService.get_plans(
+            db, skip=skip, limit=limit, active_only=True
+        )
+        snapshots = [MembershipPlanResponse.model_validate(p) for p in plans]
+        await cache_set_json(
+            cache_key,
+            [s.model_dump(mode="json") for s in snapshots],
+            PLAN_LIST_CACHE_TTL_SECONDS,
+        )
+        return snapshots
+
     @staticmethod
     async def update_plan(
         db: AsyncSession, plan_id: int, plan_data: MembershipPlanUpdate
     ) -> Optional[MembershipPlan]:
         """Update membership plan."""
+        values = plan_data.model_dump(exclude_unset=True)
+        if not values:
+            return await MembershipPlanService.get_plan(db, plan_id)
+
         result = await db.execute(
-            select(MembershipPlan).where(MembershipPlan.id == plan_id)
+            update(MembershipPlan)
+            .where(MembershipPlan.id == plan_id)
+            .values(**values)
+            .returning(MembershipPlan)
+            .execution_options(populate_existing=True)
         )
         plan = result.scalar_one_or_none()
 
         if not plan:
             return None
 
-        for field, value in plan_data.model_dump(exclude_unset=True).items():
-            setattr(plan, field, value)
-
         await db.commit()
-        await db.refresh(plan)
+        await cache_delete(_plan_cache_key(plan_id))
+        await cache_delete_pattern(PLAN_LIST_CACHE_PATTERN)
         return plan
 
     @staticmethod
     async def delete_plan(db: AsyncSession, plan_id: int) -> bool:
         """Soft delete membership plan."""
         result = await db.execute(
-            select(MembershipPlan).where(MembershipPlan.id == plan_id)
+            update(MembershipPlan)
+            .where(MembershipPlan.id == plan_id)
+            .values(is_active=False)
         )
-        plan = result.scalar_one_or_none()
 
-        if not plan:
+        if result.rowcount == 0:
             return False
 
-        plan.is_active = False
         await db.commit()
+        await cache_delete(_plan_cache_key(plan_id))
+        await cache_delete_pattern(PLAN_LIST_CACHE_PATTERN)
         return True
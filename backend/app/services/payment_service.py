@@ -3,18 +3,85 @@ Payment service for handling payment operations.
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import Optional, List, Dict, Any
+from sqlalchemy import event, func, insert, literal, select, tuple_, update
+from sqlalchemy.orm import Session, selectinload
+from typing import Optional, List, Dict, Any, Callable, Set, Tuple
 from datetime import datetime, timedelta
+from decimal import Decimal
+import asyncio
 import logging
-import json
 
+from app.db.session import AsyncSessionLocal
 from app.models.payment import Payment, PaymentHistory, PaymentStatus, PaymentMethod
 from app.models.member import Member
 from app.core.integrations.stripe_client import stripe_client
 
 logger = logging.getLogger(__name__)
 
+# Strong references to in-flight Stripe tasks so they are not garbage collected
+_stripe_tasks: Set[asyncio.Task] = set()
+
+# Retry policy for failed payments: delay in hours by attempt number
+MAX_RETRIES = 5
+RETRY_DELAY_HOURS = (2, 4, 8, 16, 32)
+
+# Concurrent Stripe requests when processing payments in bulk
+STRIPE_SUBMIT_CONCURRENCY = 16
+
+# Session.info key holding payment history rows not yet written
+HISTORY_BUFFER_KEY = "payment_history_buffer"
+
+
+@event.listens_for(Session, "before_commit")
+def _write_buffered_history(session: Session) -> None:
+    """Write a session's buffered payment history with one executemany INSERT."""
+    buffer = session.info.pop(HISTORY_BUFFER_KEY, None)
+    if buffer:
+        # History rows reference payments that may still be pending
+        session.flush()
+        session.execute(insert(PaymentHistory), buffer)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_buffered_history(session: Session, previous_transaction) -> None:
+    """Drop buffered payment history when the transaction is rolled back."""
+    session.info.pop(HISTORY_BUFFER_KEY, None)
+
+
+async def _submit_stripe_calls(
+    method: Callable,
+    specs: List[Dict[str, Any]],
+    concurrency: int = STRIPE_SUBMIT_CONCURRENCY
+) -> List[Any]:
+    """
+    Run many Stripe client calls concurrently.
+
+    The Stripe SDK blocks, so each request runs in a worker thread; a
+    semaphore bounds how many are in flight at once.
+
+    Args:
+        method: Stripe client method, e.g. stripe_client.create_payment_intent
+        specs: List of keyword-argument dictionaries for the method
+        concurrency: Maximum number of simultaneous Stripe requests
+
+    Returns:
+        List of Stripe objects (None where the call failed), in input order
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def submit(spec: Dict[str, Any]):
+        async with semaphore:
+            return await asyncio.to_thread(method, **spec)
+
+    return await asyncio.gather(*(submit(spec) for spec in specs))
+
+
+def _intent_idempotency_key(payment: Payment) -> str:
+    """Idempotency key for a payment's Stripe intent; each retry gets its own."""
+    if payment.retry_count:
+        return f"pay_{payment.id}_retry_{payment.retry_count}"
+    return f"pay_{payment.id}"
+
 
 class PaymentService:
     """Service for payment operations."""
@@ -23,7 +90,7 @@ class PaymentService:
     async def create_payment(
         db: AsyncSession,
         member_id: int,
-        amount: float,
+        amount: Decimal,
         payment_method: PaymentMethod,
         membership_plan_id: Optional[int] = None,
         description: Optional[str] = None,
@@ -44,12 +111,11 @@ class PaymentService:
         Returns:
             Created Payment object
         """
+        # Money is stored as NUMERIC; accept floats from older callers
+        amount = Decimal(str(amount))
+
         try:
-            # Get member
-            result = await db.execute(
-                select(Member).where(Member.id == member_id)
-            )
-            member = result.scalar_one_or_none()
+            member = await db.get(Member, member_id)
 
             if not member:
                 logger.error(f"Member {member_id} not found")
@@ -60,88 +126,358 @@ class PaymentService:
                 member_id=member_id,
                 amount=amount,
                 currency="usd",
-                status=PaymentStatus.PENDING,
+                status=PaymentStatus.PENDING.value,
                 payment_method=payment_method,
                 description=description,
                 membership_plan_id=membership_plan_id
             )
 
-            # If payment method is card and auto_process is True, create Stripe payment intent
-            if payment_method == PaymentMethod.CARD and auto_process:
-                # Ensure member has Stripe customer ID
-                if not member.stripe_customer_id:
-                    user = member.user
-                    customer = stripe_client.create_customer(
-                        email=user.email,
-                        name=user.full_name,
-                        metadata={
-                            "member_id": member.id,
-                            "user_id": user.id
-                        }
-                    )
-
-                    if customer:
-                        member.stripe_customer_id = customer.id
-                        await db.commit()
-                    else:
-                        logger.error(f"Failed to create Stripe customer for member {member_id}")
-
-                # Create payment intent
-                if member.stripe_customer_id:
-                    payment_intent = stripe_client.create_payment_intent(
-                        amount=amount,
-                        customer_id=member.stripe_customer_id,
-                        metadata={
-                            "member_id": member_id,
-                            "payment_id": "pending"  # Will be updated after insert
-                        },
-                        description=description
-                    )
-
-                    if payment_intent:
-                        payment.stripe_payment_intent_id = payment_intent.id
-                        payment.status = PaymentStatus.PROCESSING
-
+            # Flush for the payment ID, then commit payment and history together
             db.add(payment)
-            await db.commit()
-            await db.refresh(payment)
+            await db.flush()
 
-            # Create payment history entry
             await PaymentService.add_payment_history(
                 db,
                 payment.id,
                 "created",
                 None,
-                PaymentStatus.PENDING.value
+                PaymentStatus.PENDING.value,
+                commit=False
             )
 
+            await db.commit()
+
             logger.info(f"Payment created: {payment.id} for member {member_id}, amount ${amount}")
-            return payment
 
         except Exception as e:
             logger.error(f"Error creating payment: {e}")
             await db.rollback()
             return None
 
+        # Stripe calls happen after the payment is persisted, off the request path
+        if payment_method == PaymentMethod.CARD and auto_process:
+            task = asyncio.create_task(
+                PaymentService._attach_stripe_intent(payment.id)
+            )
+            _stripe_tasks.add(task)
+            task.add_done_callback(_stripe_tasks.discard)
+
+        return payment
+
     @staticmethod
-    async def get_payment(db: AsyncSession, payment_id: int) -> Optional[Payment]:
-        """Get a payment by ID."""
+    async def _attach_stripe_intent(payment_id: int) -> None:
+        """
+        Create the Stripe customer and payment intent for a pending payment.
+
+        Runs in its own session. Stripe requests carry idempotency keys so a
+        retried attach does not create duplicate customers or intents; the
+        Stripe webhook remains the source of truth for the final status.
+        If the customer or intent cannot be created, the payment is marked
+        failed so the retry job picks it up.
+
+        Args:
+            payment_id: Payment ID
+        """
+        try:
+            async with AsyncSessionLocal() as db:
+                payment = await db.get(
+                    Payment,
+                    payment_id,
+                    options=[selectinload(Payment.member).selectinload(Member.user)]
+                )
+                if not payment:
+                    logger.error(f"Payment {payment_id} not found")
+                    return
+
+                try:
+                    failure_reason = await PaymentService._create_stripe_intent(db, payment)
+                except Exception as e:
+                    logger.error(f"Error creating Stripe payment intent for payment {payment_id}: {e}")
+                    await db.rollback()
+                    await db.refresh(payment)
+                    failure_reason = "Stripe payment intent creation failed"
+
+                # A webhook may already have moved the payment on
+                if failure_reason and payment.status == PaymentStatus.PENDING.value:
+                    await PaymentService._stage_failure(db, payment, failure_reason)
+
+                await db.commit()
+
+        except Exception as e:
+            logger.error(f"Error attaching Stripe payment intent to payment {payment_id}: {e}")
+
+    @staticmethod
+    async def _create_stripe_intent(db: AsyncSession, payment: Payment) -> Optional[str]:
+        """
+        Create the Stripe customer (if needed) and payment intent for a payment.
+
+        Args:
+            db: Database session
+            payment: Payment with its member and user loaded
+
+        Returns:
+            None on success, otherwise the failure reason
+        """
+        member = payment.member
+
+        # Ensure member has Stripe customer ID
+        if not member.stripe_customer_id:
+            user = member.user
+            customer = await asyncio.to_thread(
+                stripe_client.create_customer,
+                email=user.email,
+                name=user.full_name,
+                metadata={
+                    "member_id": member.id,
+                    "user_id": user.id
+                },
+                idempotency_key=f"cus_member_{member.id}"
+            )
+
+            if customer:
+                member.stripe_customer_id = customer.id
+            else:
+                logger.error(f"Failed to create Stripe customer for member {member.id}")
+                return "Stripe customer creation failed"
+
+        payment_intent = await asyncio.to_thread(
+            stripe_client.create_payment_intent,
+            amount=payment.amount,
+            customer_id=member.stripe_customer_id,
+            metadata={
+                "member_id": member.id,
+                "payment_id": payment.id
+            },
+            description=payment.description,
+            idempotency_key=_intent_idempotency_key(payment)
+        )
+
+        if not payment_intent:
+            logger.error(f"Failed to create Stripe payment intent for payment {payment.id}")
+            return "Stripe payment intent creation failed"
+
+        payment.stripe_payment_intent_id = payment_intent.id
+
+        # A webhook may already have moved the payment on
+        if payment.status == PaymentStatus.PENDING.value:
+            payment.status = PaymentStatus.PROCESSING.value
+            await PaymentService.add_payment_history(
+                db,
+                payment.id,
+                "payment_intent_created",
+                PaymentStatus.PENDING.value,
+                PaymentStatus.PROCESSING.value,
+                {"payment_intent_id": payment_intent.id},
+                commit=False
+            )
+
+        return None
+
+    @staticmethod
+    async def create_payments_bulk(
+        db: AsyncSession,
+        payment_specs: List[Dict[str, Any]],
+        auto_process: bool = False
+    ) -> List[Payment]:
+        """
+        Create many pending payment records in one transaction.
+
+        Specs for unknown members are skipped.
+
+        Args:
+            db: Database session
+            payment_specs: List of dictionaries with member_id, amount,
+                payment_method and optional membership_plan_id/description
+            auto_process: Create Stripe customers and payment intents for
+                card payments
+
+        Returns:
+            List of created Payment objects
+        """
+        if not payment_specs:
+            return []
+
+        # Fetch all members and their users with two queries
+        member_ids = {spec["member_id"] for spec in payment_specs}
         result = await db.execute(
-            select(Payment).where(Payment.id == payment_id)
+            select(Member)
+            .options(selectinload(Member.user))
+            .where(Member.id.in_(member_ids))
         )
-        return result.scalar_one_or_none()
+        members = {member.id: member for member in result.scalars()}
+
+        rows = []
+        for spec in payment_specs:
+            if spec["member_id"] not in members:
+                logger.error(f"Member {spec['member_id']} not found")
+                continue
+
+            rows.append({
+                "member_id": spec["member_id"],
+                "amount": Decimal(str(spec["amount"])),
+                "currency": "usd",
+                "status": PaymentStatus.PENDING.value,
+                "payment_method": spec["payment_method"],
+                "description": spec.get("description"),
+                "membership_plan_id": spec.get("membership_plan_id"),
+            })
+
+        if not rows:
+            return []
+
+        try:
+            result = await db.execute(insert(Payment).returning(Payment), rows)
+            payments = list(result.scalars().all())
+
+            # Buffered and written in one batch at commit
+            for payment in payments:
+                await PaymentService.add_payment_history(
+                    db,
+                    payment.id,
+                    "created",
+                    None,
+                    PaymentStatus.PENDING.value,
+                    commit=False
+                )
+
+            await db.commit()
+
+        except Exception as e:
+            logger.error(f"Error creating payments in bulk: {e}")
+            await db.rollback()
+            return []
+
+        logger.info(f"Created {len(payments)} payments in bulk")
+
+        if auto_process:
+            await PaymentService._process_card_payments(db, payments, members)
+
+        return payments
+
+    @staticmethod
+    async def _process_card_payments(
+        db: AsyncSession,
+        payments: List[Payment],
+        members: Dict[int, Member]
+    ) -> None:
+        """
+        Submit Stripe payment intents for pending card payments concurrently.
+
+        Members without a Stripe customer get one first, also concurrently.
+        Payments whose customer or intent cannot be created are marked
+        failed so the retry job picks them up.
+
+        Args:
+            db: Database session
+            payments: Newly created payments
+            members: Members (with users loaded) by ID
+        """
+        card_payments = [p for p in payments if p.payment_method == PaymentMethod.CARD]
+        if not card_payments:
+            return
+
+        # Ensure members have Stripe customer IDs
+        new_customers = list({
+            p.member_id: members[p.member_id]
+            for p in card_payments
+            if not members[p.member_id].stripe_customer_id
+        }.values())
+        if new_customers:
+            customers = await _submit_stripe_calls(
+                stripe_client.create_customer,
+                [
+                    {
+                        "email": member.user.email,
+                        "name": member.user.full_name,
+                        "metadata": {"member_id": member.id, "user_id": member.user_id},
+                        "idempotency_key": f"cus_member_{member.id}",
+                    }
+                    for member in new_customers
+                ]
+            )
+            for member, customer in zip(new_customers, customers):
+                if customer:
+                    member.stripe_customer_id = customer.id
+                else:
+                    logger.error(f"Failed to create Stripe customer for member {member.id}")
+
+        to_submit = []
+        for payment in card_payments:
+            if members[payment.member_id].stripe_customer_id:
+                to_submit.append(payment)
+            else:
+                await PaymentService._stage_failure(
+                    db, payment, "Stripe customer creation failed"
+                )
+
+        if not to_submit:
+            await db.commit()
+            return
+
+        payment_intents = await _submit_stripe_calls(stripe_client.create_payment_intent, [
+            {
+                "amount": p.amount,
+                "customer_id": members[p.member_id].stripe_customer_id,
+                "metadata": {"member_id": p.member_id, "payment_id": p.id},
+                "description": p.description,
+                "idempotency_key": _intent_idempotency_key(p),
+            }
+            for p in to_submit
+        ])
+
+        for payment, payment_intent in zip(to_submit, payment_intents):
+            if not payment_intent:
+                logger.error(f"Failed to create Stripe payment intent for payment {payment.id}")
+                await PaymentService._stage_failure(
+                    db, payment, "Stripe payment intent creation failed"
+                )
+                continue
+
+            payment.stripe_payment_intent_id = payment_intent.id
+            payment.status = PaymentStatus.PROCESSING.value
+            await PaymentService.add_payment_history(
+                db,
+                payment.id,
+                "payment_intent_created",
+                PaymentStatus.PENDING.value,
+                PaymentStatus.PROCESSING.value,
+                {"payment_intent_id": payment_intent.id},
+                commit=False
+            )
+
+        await db.commit()
+
+    @staticmethod
+    async def get_payment(db: AsyncSession, payment_id: int) -> Optional[Payment]:
+        """Get a payment by ID."""
+        return await db.get(Payment, payment_id)
 
     @staticmethod
     async def get_member_payments(
         db: AsyncSession,
         member_id: int,
-        limit: int = 50
+        limit: int = 50,
+        cursor: Optional[Tuple[datetime, int]] = None
     ) -> List[Payment]:
-        """Get all payments for a member."""
+        """
+        Get a page of payments for a member, newest first.
+
+        Args:
+            db: Database session
+            member_id: Member ID
+            limit: Page size
+            cursor: (created_at, id) of the last payment on the previous page
+
+        Returns:
+            List of Payment objects
+        """
+        query = select(Payment).where(Payment.member_id == member_id)
+        if cursor is not None:
+            query = query.where(tuple_(Payment.created_at, Payment.id) < cursor)
+
         result = await db.execute(
-            select(Payment)
-            .where(Payment.member_id == member_id)
-            .order_by(Payment.created_at.desc())
+            query
+            .order_by(Payment.created_at.desc(), Payment.id.desc())
             .limit(limit)
         )
         return list(result.scalars().all())
@@ -154,34 +490,48 @@ class PaymentService:
         metadata: Optional[Dict[str, Any]] = None
     ) -> Optional[Payment]:
         """Update payment status."""
-        payment = await PaymentService.get_payment(db, payment_id)
+        values = {"status": new_status.value, "updated_at": func.now()}
+        if new_status == PaymentStatus.SUCCEEDED:
+            values["paid_at"] = func.now()
+        elif new_status == PaymentStatus.REFUNDED:
+            values["refunded_at"] = func.now()
+
+        # Lock the row and read its previous status in the same statement
+        previous = (
+            select(Payment.id, Payment.status)
+            .where(Payment.id == payment_id)
+            .with_for_update()
+            .subquery("previous")
+        )
+        result = await db.execute(
+            update(Payment)
+            .where(Payment.id == previous.c.id)
+            .values(**values)
+            .returning(Payment, previous.c.status)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        row = result.one_or_none()
 
-        if not payment:
+        if not row:
             logger.error(f"Payment {payment_id} not found")
             return None
 
-        old_status = payment.status
-        payment.status = new_status
-        payment.updated_at = datetime.utcnow()
+        payment, previous_status = row
+        old_status = PaymentStatus(previous_status)
 
-        if new_status == PaymentStatus.SUCCEEDED:
-            payment.paid_at = datetime.utcnow()
-        elif new_status == PaymentStatus.REFUNDED:
-            payment.refunded_at = datetime.utcnow()
-
-        await db.commit()
-        await db.refresh(payment)
-
-        # Add to payment history
+        # Add to payment history in the same transaction
         await PaymentService.add_payment_history(
             db,
             payment_id,
             f"status_changed_to_{new_status.value}",
             old_status.value,
             new_status.value,
-            metadata
+            metadata,
+            commit=False
         )
 
+        await db.commit()
+
         logger.info(f"Payment {payment_id} status updated: {old_status} -> {new_status}")
         return payment
 
@@ -198,32 +548,52 @@ class PaymentService:
         if not payment:
             return None
 
-        payment.status = PaymentStatus.FAILED
+        await PaymentService._stage_failure(db, payment, failure_reason, failure_code)
+        await db.commit()
+
+        # next_retry_at was written as a SQL expression; load its value
+        await db.refresh(payment, ["next_retry_at"])
+
+        logger.warning(
+            f"Payment {payment_id} failed (attempt {payment.retry_count}): {failure_reason}"
+        )
+        return payment
+
+    @staticmethod
+    async def _stage_failure(
+        db: AsyncSession,
+        payment: Payment,
+        failure_reason: str,
+        failure_code: Optional[str] = None
+    ) -> None:
+        """
+        Mark a payment failed and schedule its next retry, without committing.
+
+        next_retry_at is set to a SQL expression and stays unloaded after
+        the flush; refresh it before reading.
+        """
+        previous_status = payment.status
+        payment.status = PaymentStatus.FAILED.value
         payment.failure_reason = failure_reason
         payment.failure_code = failure_code
-        payment.retry_count += 1
+        payment.retry_count = min(payment.retry_count + 1, MAX_RETRIES)
 
         # Schedule next retry (exponential backoff)
-        retry_delay_hours = 2 ** payment.retry_count  # 2, 4, 8, 16 hours
-        payment.next_retry_at = datetime.utcnow() + timedelta(hours=retry_delay_hours)
-
-        await db.commit()
-        await db.refresh(payment)
+        retry_delay_hours = RETRY_DELAY_HOURS[
+            min(payment.retry_count, len(RETRY_DELAY_HOURS)) - 1
+        ]
+        payment.next_retry_at = func.now() + timedelta(hours=retry_delay_hours)
 
-        # Add to payment history
+        # Add to payment history in the same transaction
         await PaymentService.add_payment_history(
             db,
-            payment_id,
+            payment.id,
             "payment_failed",
-            None,
+            previous_status,
             PaymentStatus.FAILED.value,
-            {"failure_reason": failure_reason, "failure_code": failure_code}
-        )
-
-        logger.warning(
-            f"Payment {payment_id} failed (attempt {payment.retry_count}): {failure_reason}"
+            {"failure_reason": failure_reason, "failure_code": failure_code},
+            commit=False
         )
-        return payment
 
     @staticmethod
     async def add_payment_history(
@@ -232,54 +602,161 @@ class PaymentService:
         event_type: str,
         previous_status: Optional[str] = None,
         new_status: Optional[str] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        commit: bool = True
     ):
-        """Add an entry to payment history."""
-        history_entry = PaymentHistory(
-            payment_id=payment_id,
-            event_type=event_type,
-            previous_status=previous_status,
-            new_status=new_status,
-            metadata=json.dumps(metadata) if metadata else None
-        )
+        """
+        Add an entry to payment history.
 
-        db.add(history_entry)
-        await db.commit()
+        Entries are buffered on the session and written in one batch when
+        the transaction commits. Pass commit=False to leave the commit to
+        the caller.
+        """
+        db.info.setdefault(HISTORY_BUFFER_KEY, []).append({
+            "payment_id": payment_id,
+            "event_type": event_type,
+            "previous_status": previous_status,
+            "new_status": new_status,
+            "event_metadata": metadata,
+        })
+
+        if commit:
+            await db.commit()
 
     @staticmethod
     async def get_failed_payments_for_retry(
-        db: AsyncSession
+        db: AsyncSession,
+        batch_size: int = 100
     ) -> List[Payment]:
-        """Get failed payments that are ready for retry."""
-        now = datetime.utcnow()
+        """
+        Lock a batch of failed payments that are ready for retry.
+
+        Rows already locked by another worker are skipped, so several retry
+        workers can run at once. Locks are held until the caller's
+        transaction ends.
+
+        Args:
+            db: Database session
+            batch_size: Maximum number of payments to lock
+
+        Returns:
+            List of locked Payment objects, longest overdue first
+        """
         result = await db.execute(
             select(Payment)
             .where(
-                Payment.status == PaymentStatus.FAILED,
-                Payment.retry_count < 5,  # Max 5 retry attempts
-                Payment.next_retry_at <= now
+                # Inlined so generic plans can still match ix_payments_retry_due
+                Payment.status == literal(PaymentStatus.FAILED.value, literal_execute=True),
+                Payment.retry_count < literal(MAX_RETRIES, literal_execute=True),
+                Payment.next_retry_at <= func.now()
             )
             .order_by(Payment.next_retry_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
         )
         return list(result.scalars().all())
 
+    @staticmethod
+    async def retry_failed_payments(
+        db: AsyncSession,
+        batch_size: int = 100
+    ) -> int:
+        """
+        Claim a batch of due failed payments and retry them through Stripe.
+
+        Claimed payments are moved on in one transaction before any Stripe
+        call is made, so no other worker can pick them up; the Stripe
+        webhook reports the final outcome. Payments with an intent are
+        confirmed again; card payments whose intent was never created go
+        back through intent creation.
+
+        Args:
+            db: Database session
+            batch_size: Maximum number of payments to retry
+
+        Returns:
+            Number of payments claimed
+        """
+        payments = await PaymentService.get_failed_payments_for_retry(db, batch_size)
+        if not payments:
+            return 0
+
+        to_confirm = []
+        to_create = []
+        for payment in payments:
+            if payment.stripe_payment_intent_id:
+                new_status = PaymentStatus.PROCESSING
+                to_confirm.append(payment)
+            elif payment.payment_method == PaymentMethod.CARD:
+                new_status = PaymentStatus.PENDING
+                to_create.append(payment)
+            else:
+                await PaymentService._stage_failure(
+                    db, payment, "No payment intent to retry"
+                )
+                continue
+
+            payment.status = new_status.value
+            await PaymentService.add_payment_history(
+                db,
+                payment.id,
+                "retry_started",
+                PaymentStatus.FAILED.value,
+                new_status.value,
+                {"attempt": payment.retry_count},
+                commit=False
+            )
+
+        await db.commit()
+
+        if to_create:
+            result = await db.execute(
+                select(Member)
+                .options(selectinload(Member.user))
+                .where(Member.id.in_({p.member_id for p in to_create}))
+            )
+            members = {member.id: member for member in result.scalars()}
+            await PaymentService._process_card_payments(db, to_create, members)
+
+        if to_confirm:
+            payment_intents = await _submit_stripe_calls(
+                stripe_client.confirm_payment_intent,
+                [{"payment_intent_id": p.stripe_payment_intent_id} for p in to_confirm]
+            )
+
+            failed = [
+                payment for payment, payment_intent in zip(to_confirm, payment_intents)
+                if not payment_intent
+            ]
+            for payment in failed:
+                await PaymentService._stage_failure(
+                    db, payment, "Stripe retry request failed"
+                )
+            if failed:
+                await db.commit()
+
+        logger.info(
+            f"Retried {len(to_confirm) + len(to_create)} of {len(payments)} due payments"
+        )
+        return len(payments)
+
     @staticmethod
     async def calculate_member_revenue(
         db: AsyncSession,
         member_id: int
-    ) -> Dict[str, float]:
+    ) -> Dict[str, Any]:
         """Calculate total revenue from a member."""
         result = await db.execute(
-            select(Payment)
+            select(
+                func.coalesce(func.sum(Payment.amount), 0),
+                func.count(Payment.id)
+            )
             .where(
                 Payment.member_id == member_id,
-                Payment.status == PaymentStatus.SUCCEEDED
+                Payment.status == PaymentStatus.SUCCEEDED.value
             )
         )
-        payments = result.scalars().all()
-
-        total = sum(p.amount for p in payments)
-        count = len(payments)
+        total, count = result.one()
 
         return {
             "total_revenue": total,
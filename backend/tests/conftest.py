@@ -2,11 +2,21 @@
 Pytest configuration and fixtures for test suite.
 """
 
+import asyncio
+import hashlib
+import os
+import warnings
+
+import asyncpg
 import pytest
 import pytest_asyncio
+from sqlalchemy import event, make_url, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import NullPool
+from sqlalchemy.orm import raiseload, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from sqlalchemy.schema import CreateTable
 
 from app.db.base import Base
 from app.core.config import settings
@@ -15,6 +25,89 @@ from app.core.config import settings
 # Test database URL (use separate test database)
 TEST_DATABASE_URL = settings.DATABASE_URL.replace("/gym_ai", "/gym_ai_test")
 
+# Each pytest-xdist worker gets its own database cloned from a shared template
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+# Set once this process has built the schema template; only then is it dropped
+_template_created = False
+
+
+def _schema_fingerprint() -> str:
+    """Hash the compiled DDL so the template is rebuilt when models change."""
+    dialect = postgresql.dialect()
+    ddl = "".join(
+        str(CreateTable(table).compile(dialect=dialect))
+        for table in Base.metadata.sorted_tables
+    )
+    return hashlib.sha1(ddl.encode()).hexdigest()[:12]
+
+
+def _template_name(url) -> str:
+    return f"{url.database}_template_{_schema_fingerprint()}"
+
+
+def _worker_name(url) -> str:
+    return f"{url.database}_{XDIST_WORKER}"
+
+
+def _admin_engine(url):
+    """Engine on the maintenance database for CREATE/DROP DATABASE."""
+    return create_async_engine(
+        url.set(database="postgres"),
+        poolclass=NullPool,
+        isolation_level="AUTOCOMMIT"
+    )
+
+
+async def _drop_database(url, name: str) -> None:
+    """Drop a test database if it exists; cleanup never fails the run."""
+    admin_engine = _admin_engine(url)
+    try:
+        async with admin_engine.connect() as conn:
+            await conn.execute(text(f'DROP DATABASE IF EXISTS "{name}"'))
+    except (OSError, asyncpg.PostgresError, DBAPIError) as e:
+        warnings.warn(f"Could not drop test database {name}: {e}")
+    finally:
+        await admin_engine.dispose()
+
+
+async def _create_worker_database(url) -> None:
+    """
+    Create this worker's test database from a schema template.
+
+    The template is built once per run; workers serialise on an advisory
+    lock so only the first one creates it.
+    """
+    global _template_created
+    template_name = _template_name(url)
+    worker_name = _worker_name(url)
+
+    admin_engine = _admin_engine(url)
+    async with admin_engine.connect() as conn:
+        await conn.execute(text("SELECT pg_advisory_lock(hashtext(:name))"), {"name": template_name})
+        try:
+            exists = await conn.scalar(
+                text("SELECT 1 FROM pg_database WHERE datname = :name"),
+                {"name": template_name}
+            )
+            if not exists:
+                await conn.execute(text(f'CREATE DATABASE "{template_name}"'))
+                template_engine = create_async_engine(
+                    url.set(database=template_name), poolclass=NullPool
+                )
+                async with template_engine.begin() as template_conn:
+                    await template_conn.run_sync(Base.metadata.create_all)
+                await template_engine.dispose()
+                _template_created = True
+
+            await conn.execute(text(f'DROP DATABASE IF EXISTS "{worker_name}"'))
+            await conn.execute(
+                text(f'CREATE DATABASE "{worker_name}" TEMPLATE "{template_name}"')
+            )
+        finally:
+            await conn.execute(text("SELECT pg_advisory_unlock(hashtext(:name))"), {"name": template_name})
+    await admin_engine.dispose()
+
 
 @pytest.fixture(scope="session")
 def event_loop():
@@ -25,35 +118,123 @@ def event_loop():
     loop.close()
 
 
-@pytest_asyncio.fixture(scope="function")
-async def async_db():
+@pytest_asyncio.fixture(scope="session")
+async def async_engine():
     """
-    Create a fresh database for each test.
+    Create this worker's database and a pooled engine for the test session.
     """
-    # Create async engine
+    url = make_url(TEST_DATABASE_URL)
+    await _create_worker_database(url)
+
     engine = create_async_engine(
-        TEST_DATABASE_URL,
-        poolclass=NullPool,
+        url.set(database=_worker_name(url)),
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=5,
+        max_overflow=10,
+        pool_pre_ping=False,
         echo=False
     )
 
-    # Create all tables
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+
+    # Cleanup
+    await engine.dispose()
+    await _drop_database(url, _worker_name(url))
 
-    # Create session
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Note in the controller when an xdist worker built the template."""
+    global _template_created
+    if getattr(node, "workeroutput", {}).get("template_created"):
+        _template_created = True
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Drop the schema template once all workers are done."""
+    # xdist workers report back; only the controller (or a plain run) drops
+    if hasattr(session.config, "workerinput"):
+        session.config.workeroutput["template_created"] = _template_created
+        return
+    if not _template_created:
+        return
+    url = make_url(TEST_DATABASE_URL)
+    asyncio.run(_drop_database(url, _template_name(url)))
+
+
+@pytest_asyncio.fixture(scope="function")
+async def async_db(async_engine):
+    """
+    Provide a session whose changes are rolled back after each test.
+
+    Commits and rollbacks made by the code under test only release or roll
+    back a SAVEPOINT; the outer transaction is always rolled back.
+    """
+    connection = await async_engine.connect()
+    trans = await connection.begin()
+
+    # Create session bound to the outer transaction
     async_session = sessionmaker(
-        engine,
+        bind=connection,
         class_=AsyncSession,
-        expire_on_commit=False
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint"
     )
 
     async with async_session() as session:
+        session.info["query_log"] = []
+
+        @event.listens_for(connection.sync_connection, "before_cursor_execute")
+        def log_query(conn, cursor, statement, parameters, context, executemany):
+            session.info["query_log"].append(statement)
+
+        @event.listens_for(session.sync_session, "do_orm_execute")
+        def apply_raiseload(orm_execute_state):
+            if session.info.get("raiseload") and orm_execute_state.is_select:
+                orm_execute_state.statement = orm_execute_state.statement.options(
+                    raiseload("*")
+                )
+
         yield session
 
     # Cleanup
-    await engine.dispose()
+    await trans.rollback()
+    await connection.close()
+
+
+@pytest.fixture
+def max_queries(async_db):
+    """
+    Assert that a test issues at most a given number of SQL statements.
+
+    Call it with the limit once setup is done; statements executed after
+    that point are counted and checked at teardown.
+    """
+    query_log = async_db.info["query_log"]
+    limit = {}
+
+    def expect(n: int):
+        limit["n"] = n
+        limit["start"] = len(query_log)
+
+    yield expect
+
+    if limit:
+        executed = query_log[limit["start"]:]
+        assert len(executed) <= limit["n"], (
+            f"Expected at most {limit['n']} queries, got {len(executed)}:\n"
+            + "\n".join(executed)
+        )
+
+
+@pytest.fixture
+def strict_loading(async_db):
+    """
+    Apply raiseload("*") to every ORM query so unplanned lazy loads fail.
+    """
+    async_db.info["raiseload"] = True
+    yield async_db
+    async_db.info.pop("raiseload", None)
 
 
 @pytest.fixture
@@ -47,3 +47,91 @@ def test_create_payment_intent(mock_create):
 
     assert intent is not None
     assert intent.id == "pi_test123"
+
+
+@patch('app.core.integrations.stripe_client.stripe.Customer.retrieve')
+def test_get_customer_stripe_error_returns_none(mock_retrieve, caplog):
+    """Test that Stripe errors are logged with the object ID and swallowed."""
+    import stripe
+    mock_retrieve.side_effect = stripe.error.StripeError("boom")
+
+    client = StripeClient()
+    assert client.get_customer("cus_missing") is None
+    assert caplog.records[-1].stripe_ids == {"customer_id": "cus_missing"}
+
+
+@patch('app.core.integrations.stripe_client.stripe.Customer.create')
+def test_create_customer_stripe_error_omits_email(mock_create, caplog):
+    """Test that only ID arguments are logged when a Stripe call fails."""
+    import stripe
+    mock_create.side_effect = stripe.error.StripeError("boom")
+
+    client = StripeClient()
+    assert client.create_customer("private@example.com", "Private User") is None
+    assert caplog.records[-1].stripe_ids == {}
+    assert "private@example.com" not in caplog.text
+
+
+@patch('app.core.integrations.stripe_client.stripe.PaymentIntent.create')
+def test_create_payment_intent_converts_to_cents(mock_create):
+    """Test that dollar amounts are rounded to whole cents."""
+    mock_create.return_value = Mock(id="pi_test123")
+
+    client = StripeClient()
+    client.create_payment_intent(amount=99.99)
+    assert mock_create.call_args.kwargs["amount"] == 9999
+
+    client.create_payment_intent(amount_cents=1250)
+    assert mock_create.call_args.kwargs["amount"] == 1250
+
+
+@patch('app.core.integrations.stripe_client.stripe.PaymentIntent.create')
+def test_create_payment_intent_passes_idempotency_key(mock_create):
+    """Test that idempotency keys are forwarded to Stripe."""
+    mock_create.return_value = Mock(id="pi_test123")
+
+    client = StripeClient()
+    client.create_payment_intent(amount=10, idempotency_key="pay_1")
+    assert mock_create.call_args.kwargs["idempotency_key"] == "pay_1"
+
+
+@patch('app.core.integrations.stripe_client.stripe.Customer.modify')
+@patch('app.core.integrations.stripe_client.stripe.Customer.retrieve')
+def test_get_customer_is_cached(mock_retrieve, mock_modify):
+    """Test that repeated customer reads hit the cache until updated."""
+    mock_retrieve.return_value = Mock(id="cus_test123")
+    mock_modify.return_value = Mock(id="cus_test123")
+
+    client = StripeClient()
+    client.get_customer("cus_test123")
+    client.get_customer("cus_test123")
+    assert mock_retrieve.call_count == 1
+
+    client.update_customer("cus_test123", name="Updated")
+    assert client.get_customer("cus_test123") is mock_modify.return_value
+    assert mock_retrieve.call_count == 1
+
+
+def test_construct_webhook_event_verifies_signature():
+    """Test webhook signature verification."""
+    import hashlib
+    import hmac
+    import time
+
+    secret = "whsec_test"
+    payload = b'{"id": "evt_test123", "object": "event", "type": "payment_intent.succeeded"}'
+    timestamp = int(time.time())
+    signature = hmac.new(
+        secret.encode(), f"{timestamp}.".encode() + payload, hashlib.sha256
+    ).hexdigest()
+
+    client = StripeClient()
+    event = client.construct_webhook_event(
+        payload, f"t={timestamp},v1={signature}", secret
+    )
+    assert event is not None
+    assert event.id == "evt_test123"
+
+    assert client.construct_webhook_event(
+        payload, f"t={timestamp},v1={'0' * 64}", secret
+    ) is None
@@ -48,6 +48,41 @@ def test_get_current_capacity():
     assert config.get_current_capacity() == 100
 
 
+def test_get_current_capacity_hour_range():
+    """Test the first and last hours and rejection of out-of-range hours."""
+    config = FacilityConfig(
+        name="Test Gym",
+        total_capacity=100,
+        peak_hours_capacity={"night": 50}
+    )
+
+    assert config.get_current_capacity(0) == 50
+    assert config.get_current_capacity(23) == 50
+
+    with pytest.raises(ValueError):
+        config.get_current_capacity(24)
+    with pytest.raises(ValueError):
+        config.get_current_capacity(-1)
+
+
+def test_get_current_capacity_after_update():
+    """Test that capacity changes are picked up after a lookup."""
+    config = FacilityConfig(
+        name="Test Gym",
+        total_capacity=100,
+        peak_hours_capacity={"morning": 80}
+    )
+
+    assert config.get_current_capacity(8) == 80
+    assert config.get_current_capacity(14) == 100
+
+    config.peak_hours_capacity = {"morning": 60}
+    assert config.get_current_capacity(8) == 60
+
+    config.total_capacity = 150
+    assert config.get_current_capacity(14) == 150
+
+
 def test_is_over_capacity():
     """Test checking if facility is over capacity."""
     config = FacilityConfig(
@@ -0,0 +1,35 @@
+"""
+Tests for model metadata and mapper configuration.
+"""
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import configure_mappers
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.db.base import Base
+from app.models.member import Member
+
+
+def test_mappers_configure():
+    """Test that all models and relationships configure cleanly."""
+    configure_mappers()
+
+
+def test_schema_compiles_for_postgresql():
+    """Test that every table and index compiles to PostgreSQL DDL."""
+    dialect = postgresql.dialect()
+    for table in Base.metadata.sorted_tables:
+        assert str(CreateTable(table).compile(dialect=dialect))
+        for index in table.indexes:
+            assert str(CreateIndex(index).compile(dialect=dialect))
+
+
+def test_membership_status_matches_migration():
+    """Test that membership_status uses the lowercase labels from migration 002."""
+    assert Member.__table__.c.membership_status.type.enums == [
+        "active", "expired", "cancelled", "suspended"
+    ]
+
+    # The partial index and hybrid filter compare against the stored label
+    stmt = Member.__table__.select().where(Member.is_membership_active)
+    assert "membership_status = 'active'" in str(stmt.compile(dialect=postgresql.dialect()))
@@ -3,8 +3,46 @@ Tests for payment service.
 """
 
 import pytest
-from app.services.payment_service import PaymentService
-from app.models.payment import PaymentStatus, PaymentMethod
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import Mock, patch
+from app.core.integrations.stripe_client import stripe_client
+from app.services.payment_service import (
+    HISTORY_BUFFER_KEY,
+    MAX_RETRIES,
+    RETRY_DELAY_HOURS,
+    PaymentService,
+)
+from sqlalchemy import select
+from app.models.payment import Payment, PaymentHistory, PaymentStatus, PaymentMethod
+from app.models.member import Member
+from app.models.user import User
+
+
+async def _create_member(db, email: str) -> Member:
+    """Create a user and member profile."""
+    user = User(email=email, hashed_password="x", full_name="Payment User")
+    db.add(user)
+    await db.flush()
+    member = Member(user_id=user.id)
+    db.add(member)
+    await db.flush()
+    return member
+
+
+async def _create_payment(db, member_id: int, status: PaymentStatus, **kwargs) -> Payment:
+    """Create a card payment in the given status."""
+    payment = Payment(
+        member_id=member_id,
+        amount=Decimal("49.99"),
+        status=status.value,
+        payment_method=PaymentMethod.CARD,
+        **kwargs
+    )
+    db.add(payment)
+    await db.flush()
+    return payment
 
 
 @pytest.mark.asyncio
@@ -18,22 +56,365 @@ async def test_create_payment(async_db, sample_user_data, sample_member_data, sa
     pass
 
 
+@pytest.mark.asyncio
+async def test_create_payments_bulk(async_db, max_queries):
+    """Test creating many payments with a fixed number of statements."""
+    members = [await _create_member(async_db, f"bulk{i}@example.com") for i in range(3)]
+    specs = [
+        {
+            "member_id": member.id,
+            "amount": "20.00",
+            "payment_method": PaymentMethod.CASH,
+            "description": f"Class pack {n}",
+        }
+        for member in members
+        for n in range(2)
+    ]
+    # Unknown members are skipped
+    specs.append({"member_id": 999999, "amount": "20.00", "payment_method": PaymentMethod.CASH})
+
+    # Members, users, payments, history, savepoint release, and the history check
+    max_queries(6)
+    payments = await PaymentService.create_payments_bulk(async_db, specs)
+
+    assert len(payments) == 6
+    assert all(p.status == PaymentStatus.PENDING.value for p in payments)
+    assert all(p.amount == Decimal("20.00") for p in payments)
+    assert sorted(p.member_id for p in payments) == sorted(s["member_id"] for s in specs[:-1])
+
+    history = (await async_db.execute(
+        select(PaymentHistory.payment_id, PaymentHistory.event_type, PaymentHistory.new_status)
+    )).all()
+    assert sorted(history) == sorted(
+        (p.id, "created", PaymentStatus.PENDING.value) for p in payments
+    )
+
+
 @pytest.mark.asyncio
 async def test_update_payment_status(async_db):
     """Test updating payment status."""
-    # TODO: Implement test
-    pass
+    member = await _create_member(async_db, "status@example.com")
+    payment = await _create_payment(async_db, member.id, PaymentStatus.PROCESSING)
+
+    updated = await PaymentService.update_payment_status(
+        async_db, payment.id, PaymentStatus.SUCCEEDED, {"source": "webhook"}
+    )
+
+    assert updated.id == payment.id
+    assert updated.status == PaymentStatus.SUCCEEDED.value
+    assert updated.paid_at is not None
+
+    history = (await async_db.execute(
+        select(PaymentHistory).where(PaymentHistory.payment_id == payment.id)
+    )).scalars().all()
+    assert len(history) == 1
+    assert history[0].event_type == "status_changed_to_succeeded"
+    assert history[0].previous_status == PaymentStatus.PROCESSING.value
+    assert history[0].new_status == PaymentStatus.SUCCEEDED.value
+    assert history[0].event_metadata == {"source": "webhook"}
+
+
+@pytest.mark.asyncio
+async def test_update_payment_status_not_found(async_db):
+    """Test updating the status of a payment that does not exist."""
+    result = await PaymentService.update_payment_status(
+        async_db, 999999, PaymentStatus.SUCCEEDED
+    )
+
+    assert result is None
+    history = (await async_db.execute(select(PaymentHistory))).scalars().all()
+    assert history == []
 
 
 @pytest.mark.asyncio
 async def test_process_failed_payment(async_db):
     """Test processing a failed payment with retry logic."""
-    # TODO: Implement test
-    pass
+    member = await _create_member(async_db, "failed@example.com")
+    payment = await _create_payment(async_db, member.id, PaymentStatus.PROCESSING)
+
+    payment = await PaymentService.process_failed_payment(
+        async_db, payment.id, "Card declined", "card_declined"
+    )
+
+    assert payment.status == PaymentStatus.FAILED.value
+    assert payment.failure_code == "card_declined"
+    assert payment.retry_count == 1
+    # Readable without a lazy load; now() is fixed for the test transaction
+    assert payment.next_retry_at - payment.updated_at == timedelta(hours=2)
+
+
+@pytest.mark.asyncio
+async def test_process_failed_payment_caps_retries(async_db):
+    """Test that retry_count stops at MAX_RETRIES and uses the last delay."""
+    member = await _create_member(async_db, "capped@example.com")
+    payment = await _create_payment(
+        async_db, member.id, PaymentStatus.PROCESSING, retry_count=MAX_RETRIES - 1
+    )
+
+    for _ in range(2):
+        payment = await PaymentService.process_failed_payment(
+            async_db, payment.id, "Card declined"
+        )
+        assert payment.retry_count == MAX_RETRIES
+        assert payment.next_retry_at - payment.updated_at == timedelta(
+            hours=RETRY_DELAY_HOURS[-1]
+        )
+
+    # Exhausted payments are no longer picked up
+    assert await PaymentService.get_failed_payments_for_retry(async_db) == []
+
+
+@pytest.mark.asyncio
+async def test_get_failed_payments_for_retry(async_db):
+    """Test selecting due failed payments for retry."""
+    member = await _create_member(async_db, "due@example.com")
+    now = datetime.now(timezone.utc)
+    overdue = await _create_payment(
+        async_db, member.id, PaymentStatus.FAILED, next_retry_at=now - timedelta(hours=2)
+    )
+    due = await _create_payment(
+        async_db, member.id, PaymentStatus.FAILED, next_retry_at=now - timedelta(hours=1)
+    )
+    # Not due yet, out of retries, or not failed
+    await _create_payment(
+        async_db, member.id, PaymentStatus.FAILED, next_retry_at=now + timedelta(hours=1)
+    )
+    await _create_payment(
+        async_db, member.id, PaymentStatus.FAILED,
+        next_retry_at=now - timedelta(hours=1), retry_count=MAX_RETRIES
+    )
+    await _create_payment(
+        async_db, member.id, PaymentStatus.PROCESSING, next_retry_at=now - timedelta(hours=1)
+    )
+
+    payments = await PaymentService.get_failed_payments_for_retry(async_db)
+    assert [p.id for p in payments] == [overdue.id, due.id]
+
+    payments = await PaymentService.get_failed_payments_for_retry(async_db, batch_size=1)
+    assert [p.id for p in payments] == [overdue.id]
+
+    # Thresholds are inlined to match ix_payments_retry_due; rows are claimed
+    statement = async_db.info["query_log"][-1]
+    assert "status = 'failed'" in statement
+    assert f"retry_count < {MAX_RETRIES}" in statement
+    assert "FOR UPDATE SKIP LOCKED" in statement
+
+
+@pytest.mark.asyncio
+async def test_retry_failed_payments(async_db):
+    """Test claiming due payments and confirming them through Stripe."""
+    member = await _create_member(async_db, "retry@example.com")
+    past = datetime.now(timezone.utc) - timedelta(hours=1)
+    confirmed = await _create_payment(
+        async_db, member.id, PaymentStatus.FAILED,
+        stripe_payment_intent_id="pi_ok", retry_count=1,
+        next_retry_at=past - timedelta(hours=1)
+    )
+    rejected = await _create_payment(
+        async_db, member.id, PaymentStatus.FAILED,
+        stripe_payment_intent_id="pi_rejected", retry_count=2, next_retry_at=past
+    )
+
+    def confirm(payment_intent_id):
+        return Mock(id=payment_intent_id) if payment_intent_id == "pi_ok" else None
+
+    with patch.object(
+        stripe_client, "confirm_payment_intent", Mock(side_effect=confirm)
+    ) as mock_confirm:
+        claimed = await PaymentService.retry_failed_payments(async_db)
+
+    assert claimed == 2
+    assert mock_confirm.call_count == 2
+
+    # Claimed and confirmed: left in processing for the webhook
+    assert confirmed.status == PaymentStatus.PROCESSING.value
+    assert confirmed.retry_count == 1
+
+    # Confirmation failed: failed again with the next backoff step
+    await async_db.refresh(rejected, ["next_retry_at", "updated_at"])
+    assert rejected.status == PaymentStatus.FAILED.value
+    assert rejected.retry_count == 3
+    assert rejected.next_retry_at - rejected.updated_at == timedelta(
+        hours=RETRY_DELAY_HOURS[2]
+    )
+
+    history = (await async_db.execute(
+        select(PaymentHistory.payment_id, PaymentHistory.event_type)
+        .order_by(PaymentHistory.id)
+    )).all()
+    assert history == [
+        (confirmed.id, "retry_started"),
+        (rejected.id, "retry_started"),
+        (rejected.id, "payment_failed"),
+    ]
+
+    # Nothing is due any more
+    with patch.object(stripe_client, "confirm_payment_intent") as mock_confirm:
+        assert await PaymentService.retry_failed_payments(async_db) == 0
+    mock_confirm.assert_not_called()
 
 
 @pytest.mark.asyncio
-async def test_calculate_member_revenue(async_db):
+async def test_attach_stripe_intent_failure_marks_payment_failed(async_db):
+    """Test that a payment is failed, not left pending, when Stripe setup fails."""
+    member = await _create_member(async_db, "nocustomer@example.com")
+    payment = await _create_payment(async_db, member.id, PaymentStatus.PENDING)
+    payment_id = payment.id
+    await async_db.commit()
+    async_db.expunge_all()
+
+    @asynccontextmanager
+    async def session():
+        yield async_db
+
+    with patch("app.services.payment_service.AsyncSessionLocal", session), \
+            patch.object(stripe_client, "create_customer", Mock(return_value=None)), \
+            patch.object(stripe_client, "create_payment_intent") as mock_intent:
+        await PaymentService._attach_stripe_intent(payment_id)
+
+    mock_intent.assert_not_called()
+    payment = await async_db.get(Payment, payment_id)
+    assert payment.status == PaymentStatus.FAILED.value
+    assert payment.failure_reason == "Stripe customer creation failed"
+    assert payment.retry_count == 1
+    assert payment.stripe_payment_intent_id is None
+
+
+@pytest.mark.asyncio
+async def test_retry_failed_payments_creates_missing_intent(async_db):
+    """Test that a failed payment without an intent gets one on retry."""
+    member = await _create_member(async_db, "nointent@example.com")
+    member.stripe_customer_id = "cus_retry"
+    past = datetime.now(timezone.utc) - timedelta(hours=1)
+    created = await _create_payment(
+        async_db, member.id, PaymentStatus.FAILED, retry_count=1, next_retry_at=past
+    )
+    rejected = await _create_payment(
+        async_db, member.id, PaymentStatus.FAILED, retry_count=1,
+        next_retry_at=past + timedelta(minutes=1)
+    )
+
+    def create_intent(metadata, idempotency_key, **kwargs):
+        if metadata["payment_id"] == created.id:
+            return Mock(id="pi_created")
+        return None
+
+    with patch.object(
+        stripe_client, "create_payment_intent", Mock(side_effect=create_intent)
+    ) as mock_create:
+        assert await PaymentService.retry_failed_payments(async_db) == 2
+
+    # Each retry attempt uses its own idempotency key
+    keys = {call.kwargs["idempotency_key"] for call in mock_create.call_args_list}
+    assert keys == {f"pay_{created.id}_retry_1", f"pay_{rejected.id}_retry_1"}
+
+    assert created.status == PaymentStatus.PROCESSING.value
+    assert created.stripe_payment_intent_id == "pi_created"
+
+    # Still failed with another attempt counted, so it is retried later
+    assert rejected.status == PaymentStatus.FAILED.value
+    assert rejected.retry_count == 2
+    assert rejected.stripe_payment_intent_id is None
+
+    history = (await async_db.execute(
+        select(
+            PaymentHistory.payment_id,
+            PaymentHistory.event_type,
+            PaymentHistory.new_status
+        )
+        .order_by(PaymentHistory.id)
+    )).all()
+    assert history == [
+        (created.id, "retry_started", PaymentStatus.PENDING.value),
+        (rejected.id, "retry_started", PaymentStatus.PENDING.value),
+        (created.id, "payment_intent_created", PaymentStatus.PROCESSING.value),
+        (rejected.id, "payment_failed", PaymentStatus.FAILED.value),
+    ]
+
+
+def _history_inserts(db, start: int) -> list:
+    """Payment history INSERTs logged since the given query_log position."""
+    return [
+        statement for statement in db.info["query_log"][start:]
+        if statement.startswith("INSERT INTO payment_history")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_payment_history_written_at_commit(async_db):
+    """Test that buffered payment history is written in one INSERT at commit."""
+    member = await _create_member(async_db, "buffer@example.com")
+    payment = await _create_payment(async_db, member.id, PaymentStatus.PENDING)
+    start = len(async_db.info["query_log"])
+
+    await PaymentService.add_payment_history(async_db, payment.id, "created", commit=False)
+    await PaymentService.add_payment_history(async_db, payment.id, "note", commit=False)
+    assert _history_inserts(async_db, start) == []
+
+    await async_db.commit()
+
+    assert len(_history_inserts(async_db, start)) == 1
+    assert HISTORY_BUFFER_KEY not in async_db.info
+    history = (await async_db.execute(
+        select(PaymentHistory.event_type)
+        .where(PaymentHistory.payment_id == payment.id)
+        .order_by(PaymentHistory.id)
+    )).scalars().all()
+    assert history == ["created", "note"]
+
+
+@pytest.mark.asyncio
+async def test_payment_history_discarded_on_rollback(async_db):
+    """Test that a rollback drops buffered payment history."""
+    member = await _create_member(async_db, "rollback@example.com")
+    payment = await _create_payment(async_db, member.id, PaymentStatus.PENDING)
+    await async_db.commit()
+
+    await PaymentService.add_payment_history(async_db, payment.id, "created", commit=False)
+    await async_db.rollback()
+    assert HISTORY_BUFFER_KEY not in async_db.info
+
+    start = len(async_db.info["query_log"])
+    await async_db.commit()
+    assert _history_inserts(async_db, start) == []
+
+
+@pytest.mark.asyncio
+async def test_commit_without_buffered_history(async_db):
+    """Test that a commit with nothing buffered issues no history INSERT."""
+    await _create_member(async_db, "empty@example.com")
+    start = len(async_db.info["query_log"])
+
+    await async_db.commit()
+
+    assert _history_inserts(async_db, start) == []
+
+
+@pytest.mark.asyncio
+async def test_calculate_member_revenue(async_db, strict_loading, max_queries):
     """Test calculating total revenue from a member."""
-    # TODO: Implement test
-    pass
+    user = User(email="revenue@example.com", hashed_password="x", full_name="Revenue User")
+    async_db.add(user)
+    await async_db.flush()
+    member = Member(user_id=user.id)
+    async_db.add(member)
+    await async_db.flush()
+
+    for amount, payment_status in [
+        ("50.00", PaymentStatus.SUCCEEDED),
+        ("25.50", PaymentStatus.SUCCEEDED),
+        ("99.99", PaymentStatus.FAILED),
+    ]:
+        async_db.add(Payment(
+            member_id=member.id,
+            amount=Decimal(amount),
+            status=payment_status.value,
+            payment_method=PaymentMethod.CASH
+        ))
+    await async_db.flush()
+
+    max_queries(1)
+    revenue = await PaymentService.calculate_member_revenue(async_db, member.id)
+
+    assert revenue["total_revenue"] == Decimal("75.50")
+    assert revenue["payment_count"] == 2